@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,7 +50,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'tutorly.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise, async-capable for ASGI
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,7 +58,13 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tutorly.querycount.QueryCountMiddleware',
 ]
+
+# Requests over any of these are logged by QueryCountMiddleware
+QUERY_COUNT_WARNING_THRESHOLD = 20
+QUERY_TIME_WARNING_MS = 200
+QUERY_DUPLICATE_WARNING_THRESHOLD = 5
 CORS_ALLOW_ALL_ORIGINS = True
 
 ROOT_URLCONF = 'backend.urls'
@@ -80,26 +87,148 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
+# Trained recommender artifacts (see `manage.py train_recommender`)
+RECOMMENDER_ARTIFACT_DIR = BASE_DIR / 'artifacts' / 'recommender'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    return default if value is None else value.lower() in ('1', 'true', 'yes', 'on')
+
+
+# DJANGO_DB_ENGINE=postgres switches to the Postgres profile; anything else keeps SQLite
+if os.environ.get('DJANGO_DB_ENGINE', 'sqlite') in ('postgres', 'postgresql'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'tutorly'),
+            'USER': os.environ.get('DJANGO_DB_USER', 'tutorly'),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DJANGO_DB_PORT', '5432'),
+            # ✅ Keep connections open between requests instead of reconnecting every time.
+            # Under ASGI each request runs its queries on a thread of its own, so use DJANGO_DB_POOL there.
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            # The export/precompute paths stream with .iterator(), which uses server-side cursors
+            # here; a transaction-pooling PgBouncer can't hold them across transactions.
+            'DISABLE_SERVER_SIDE_CURSORS': env_flag('DJANGO_DB_PGBOUNCER'),
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DJANGO_DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+    if env_flag('DJANGO_DB_POOL'):
+        # In-process pool; needs psycopg 3 (`pip install "psycopg[pool]"`) and CONN_MAX_AGE = 0
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX', 10)),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if env_flag('DJANGO_SQLITE_TUNED', default=True):
+        # ✅ WAL lets readers run alongside the single writer; writers wait on busy_timeout
+        # instead of failing with "database is locked", and IMMEDIATE takes the write lock at
+        # BEGIN so atomic() blocks can't deadlock upgrading from a read lock.
+        DATABASES['default']['OPTIONS'] = {
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f"PRAGMA busy_timeout={int(os.environ.get('DJANGO_SQLITE_BUSY_TIMEOUT_MS', 5000))};"
+                f"PRAGMA mmap_size={int(os.environ.get('DJANGO_SQLITE_MMAP_SIZE', 128 * 1024 * 1024))};"
+                'PRAGMA temp_store=MEMORY;'
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        }
+
+
+# Cache
+# Cache version keys are how writes, `train_recommender`, `precompute_recommendations` and
+# `seed_synthetic` invalidate what the server cached, so every process must share this cache:
+# point these at Redis/Memcached. Local memory only suits a single DEBUG process: `check --deploy`
+# fails on it (tutorly.E001), and those commands refuse it unless DEBUG is on.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'tutorly'),
     }
 }
 
+RECOMMENDATION_CACHE_TIMEOUT = 60 * 60  # seconds
+
+# Pre-rendered catalog pages (tutorly.catalog); hot pages are re-rendered this many
+# seconds after a course/rating write. None disables the background rebuild.
+CATALOG_CACHE_TIMEOUT = 24 * 60 * 60
+CATALOG_REBUILD_DELAY = 1.0
+
+# "Similar courses" lists (tutorly.neighbors): K per course, scored TEXT_WEIGHT × TF-IDF cosine
+# + the rest × co-rating cosine. `manage.py build_course_neighbors` rebuilds them all in blocks of
+# BLOCK_SIZE; REFRESH_ON_SAVE recomputes edited courses' lists in the background, batched into
+# one refresh REFRESH_DELAY seconds after the last save.
+COURSE_NEIGHBORS = {
+    'K': 10,
+    'TEXT_WEIGHT': 0.5,
+    'BLOCK_SIZE': 256,
+    'REFRESH_ON_SAVE': True,
+    'REFRESH_DELAY': 1.0,
+}
+
+# Threads the async views (tutorly.async_views) hand CPU-heavy scoring to, per process
+ASYNC_CPU_WORKERS = int(os.environ.get('DJANGO_ASYNC_CPU_WORKERS', 4))
+
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'tutorly.authentication.FastAuthentication',  # JWT (no query on a cached user) or DRF Token
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'tutorly.renderers.FastJSONRenderer',  # orjson when installed
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'tutorly.throttling.TokenBucketThrottle',
+    ),
+}
+
+# Seconds an authenticated user is served from the in-process cache (tutorly.authentication).
+# Writes invalidate it in the writing process; other processes see them within this time.
+AUTH_USER_CACHE_TTL = 60
+
+# Token buckets (tutorly.throttling): each user holds up to CAPACITY tokens, refilled at RATE per
+# second, and a request costs COSTS[url name] tokens (1 if unlisted). CACHE names a shared cache
+# alias so the limits hold across workers; unset keeps the buckets in each process. ENABLED=False
+# turns the throttle off (benchmark_api does so for its own in-process client).
+TOKEN_BUCKET = {
+    'ENABLED': True,
+    'CAPACITY': 60,
+    'RATE': 1.0,
+    'COSTS': {
+        'recommend_courses': 10,
+        'async-recommend-courses': 10,
+        'recommendation_data': 30,
+        'bulk_rate_courses': 5,
+    },
+    'CACHE': os.environ.get('DJANGO_THROTTLE_CACHE') or None,
+}
+
+# Expensive endpoints serve a fallback (last/popular recommendations, or a 503 for exports) while
+# MAX_IN_FLIGHT calls are already running in the process or their recent latency exceeds LATENCY_MS.
+LOAD_SHEDDING = {
+    'MAX_IN_FLIGHT': 8,
+    'LATENCY_MS': 2000,
+    'LATENCY_WINDOW': 10,  # seconds a latency reading counts for
 }
 
 
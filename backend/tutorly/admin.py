@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
-from .models import Course, Interaction, Enrollment
+from .models import Course, CourseNeighbor, Interaction, Enrollment, OutboundEmail, RecommendationSnapshot
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -11,10 +11,32 @@ class CourseAdmin(admin.ModelAdmin):
 @admin.register(Interaction)
 class InteractionAdmin(admin.ModelAdmin):
     list_display = ('user', 'course', 'rating', 'feedback')
+    list_select_related = ('user', 'course')
     search_fields = ('user__username', 'course__title')
 
 @admin.register(Enrollment)
 class EnrollmentAdmin(admin.ModelAdmin):
     list_display = ('user', 'course', 'enrolled_at')
+    list_select_related = ('user', 'course')
     search_fields = ('user__username', 'course__title')
-    list_filter = ('course',)
\ No newline at end of file
+    list_filter = ('course',)
+
+@admin.register(RecommendationSnapshot)
+class RecommendationSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('user', 'computed_at', 'stale')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    list_filter = ('stale',)
+
+@admin.register(CourseNeighbor)
+class CourseNeighborAdmin(admin.ModelAdmin):
+    list_display = ('course', 'rank', 'neighbor', 'score')
+    list_select_related = ('course', 'neighbor')
+    search_fields = ('course__title',)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    search_fields = ('subject',)
+    list_filter = ('status',)
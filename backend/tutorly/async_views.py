@@ -0,0 +1,233 @@
+import asyncio
+import functools
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .caching import (
+    CATALOG_VERSION_KEY,
+    RATINGS_VERSION_KEY,
+    aget_cached_recommendations,
+    arecommendation_cache_key,
+    aset_cached_recommendations,
+    aversioned_etag,
+    course_version_key,
+)
+from .catalog import acatalog_response
+from .models import Course, Enrollment, Interaction, RecommendationSnapshot
+from .pagination import FeedbackPagination
+from .recommender import get_content_model
+from .renderers import FastJSONRenderer
+from .serializers import CourseSerializer, InteractionSerializer, UserSerializer, course_rows
+from .throttling import TokenBucketThrottle, load_shedder
+from .views import (
+    bad_rated_course_ids,
+    collaborative_model,
+    rank_content,
+    rank_rated,
+    shed_recommendations,
+)
+
+# ✅ Bounded pool for NumPy scoring, so the event loop never runs it and a burst can't spawn threads
+cpu_pool = ThreadPoolExecutor(max_workers=getattr(settings, "ASYNC_CPU_WORKERS", 4), thread_name_prefix="tutorly-cpu")
+
+
+async def run_cpu(func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(cpu_pool, functools.partial(func, *args, **kwargs))
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def _authenticate(request):
+    request.user  # Runs the authenticators; JWT/Token lookups query the DB, so this stays sync
+    return request
+
+
+def async_api_view(methods=("GET",)):
+    """``@api_view`` + ``IsAuthenticated`` + the token-bucket throttle for ``async def`` views.
+
+    The view gets a DRF ``Request`` (``query_params``, ``data``, ``user``) authenticated with
+    the project's DEFAULT_AUTHENTICATION_CLASSES, and returns plain JSON responses.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return json_response({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+
+            request = Request(
+                request,
+                parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+                authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+            )
+            try:
+                await sync_to_async(_authenticate)(request)
+            except exceptions.APIException as error:
+                return json_response({"detail": str(error.detail)}, status=401)
+            if not (request.user and request.user.is_authenticated):
+                return json_response({"detail": "Authentication credentials were not provided."}, status=401)
+
+            throttle = TokenBucketThrottle()
+            if not await sync_to_async(throttle.allow_request)(request, None):
+                wait = math.ceil(throttle.wait())
+                response = json_response({"detail": f"Request was throttled. Expected available in {wait} seconds."},
+                                         status=429)
+                response["Retry-After"] = str(wait)
+                return response
+
+            try:
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as error:
+                return json_response(error.detail if isinstance(error.detail, dict) else {"detail": error.detail},
+                                     status=error.status_code)
+
+        wrapper.csrf_exempt = True  # Token auth, like every DRF view
+        return wrapper
+
+    return decorator
+
+
+def async_condition(etag_func):
+    """``@condition(etag_func=...)`` for async views whose ``etag_func`` is itself async.
+
+    Django's decorator calls the ETag function synchronously, so its cache round trips
+    would block the event loop.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag = await etag_func(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+async def catalog_etag(request, *args, **kwargs):
+    return await aversioned_etag(request, CATALOG_VERSION_KEY, RATINGS_VERSION_KEY)
+
+
+async def course_etag(request, id):
+    return await aversioned_etag(request, course_version_key(id))
+
+
+# ✅ Hybrid recommendations: queries on the async ORM, scoring on the CPU pool
+async def recommend_course_ids(user):
+    user_ratings = [row async for row in Interaction.objects.filter(user=user).values_list("course_id", "rating")]
+
+    if user_ratings:
+        if not await Course.objects.exclude(id__in=bad_rated_course_ids(user_ratings)).aexists():
+            return []  # No good courses left
+        # Loading a model can query the DB (item-item) or read artifacts, so it stays sync
+        model = await sync_to_async(collaborative_model)(user)
+        recommendations = await run_cpu(rank_rated, model, user.id, user_ratings)
+        if recommendations:
+            return recommendations
+
+    enrolled = [course_id async for course_id in Enrollment.objects.filter(user=user).values_list("course_id", flat=True)]
+    model = await sync_to_async(get_content_model)()
+    return await run_cpu(rank_content, model, user_ratings, enrolled)
+
+
+async def serialize_course_ids(course_ids):
+    rows = course_rows()
+    courses = {row.id: row async for row in rows.queryset(Course.objects.filter(id__in=course_ids))}
+    return rows.many(courses[course_id] for course_id in course_ids if course_id in courses)
+
+
+@async_api_view()
+async def recommend_courses(request):
+    user = request.user
+
+    cache_key = await arecommendation_cache_key(user.id)
+    payload = await aget_cached_recommendations(cache_key)
+    if payload is not None:
+        return json_response(payload)
+
+    course_ids = await (
+        RecommendationSnapshot.objects.filter(user=user, stale=False)
+        .values_list("course_ids", flat=True)
+        .afirst()
+    )
+    if course_ids is None:
+        # Same load-shedding policy (and counters) as the sync view; the name tracks both
+        if load_shedder.overloaded("recommend_courses"):
+            response = json_response(await sync_to_async(shed_recommendations)(user))
+            response["X-Load-Shed"] = "1"
+            return response
+        with load_shedder.track("recommend_courses"):
+            course_ids = await recommend_course_ids(user)
+
+    payload = {"recommended_courses": await serialize_course_ids(course_ids)}
+    await aset_cached_recommendations(cache_key, payload, user.id)
+    return json_response(payload)
+
+
+@async_api_view()
+@async_condition(catalog_etag)
+async def course_list(request):
+    return await acatalog_response(request, filtered=False)
+
+
+@async_api_view()
+@async_condition(course_etag)
+async def course_detail(request, id):
+    try:
+        course = await Course.objects.aget(id=id)
+    except Course.DoesNotExist:
+        return json_response({"error": "Course not found"}, status=404)
+    return json_response(CourseSerializer(course).data)
+
+
+@async_api_view()
+@async_condition(course_etag)
+async def course_feedback(request, id):
+    if not await Course.objects.filter(id=id).aexists():
+        return json_response({"error": "Course not found"}, status=404)
+
+    feedbacks = Interaction.objects.filter(course_id=id, feedback__gt="").select_related("user", "course")
+    paginator = FeedbackPagination()
+    page = await paginator.apaginate_queryset(feedbacks, request)
+    return json_response(paginator.get_paginated_response(InteractionSerializer(page, many=True).data).data)
+
+
+def _update_profile(user, data):
+    serializer = UserSerializer(user, data=data, partial=True)
+    if serializer.is_valid():
+        serializer.save()
+        return {"message": "Profile updated successfully!", "user": serializer.data}, 200
+    return serializer.errors, 400
+
+
+@async_api_view(methods=("GET", "PUT"))
+async def user_profile(request):
+    user = request.user
+
+    if request.method == "PUT":
+        payload, status = await sync_to_async(_update_profile)(user, request.data)
+        return json_response(payload, status=status)
+
+    enrolled_courses = Enrollment.objects.filter(user=user).values_list("course__title", flat=True)
+    return json_response({
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "enrolled_courses": [title async for title in enrolled_courses],
+    })
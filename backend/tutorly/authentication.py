@@ -0,0 +1,105 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import AUTH_HEADER_TYPE_BYTES, JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """Users by id for ``AUTH_USER_CACHE_TTL`` seconds, in this process.
+
+    Saves and deletes invalidate the entry (see signals.py); other processes notice
+    within the TTL, which bounds how long e.g. a deactivated user keeps access.
+    """
+
+    max_users = 10_000
+
+    def __init__(self):
+        self.users = {}  # str(user id) -> (user, expires at)
+        self.lock = threading.Lock()
+
+    def get(self, user_id, load):
+        now = time.monotonic()
+        entry = self.users.get(user_id)
+        if entry is None or entry[1] <= now:
+            entry = (load(), now + getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+            with self.lock:
+                if len(self.users) >= self.max_users:
+                    self.users = {key: value for key, value in self.users.items() if value[1] > now}
+                self.users[user_id] = entry
+        # Views modify request.user (profile updates, set_password), so each request gets its own copy
+        return copy.copy(entry[0])
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.users.pop(str(user_id), None)
+
+    def invalidate_on_commit(self, user_id):
+        # Again after commit, in case a request re-cached the old row before the write landed
+        self.invalidate(user_id)
+        transaction.on_commit(lambda: self.invalidate(user_id))
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """simplejwt's authentication with the ``User`` lookup served from ``user_cache``."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        # simplejwt writes the claim as a string; the cache is keyed the same way on every path
+        user = user_cache.get(str(user_id), lambda: self.load_user(user_id))
+
+        # The same checks as JWTAuthentication.get_user, run on every request, cached or not
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if jwt_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return user
+
+    def load_user(self, user_id):
+        try:
+            return self.user_model.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+
+class FastAuthentication(BaseAuthentication):
+    """The API's single authentication class, dispatching on the Authorization scheme.
+
+    ``Bearer`` tokens are checked by signature and expiry alone, with the user from the
+    in-process cache, so most requests authenticate without a query. ``Token`` keys still
+    go to DRF's TokenAuthentication; any other scheme is not ours to answer.
+    """
+
+    def __init__(self):
+        self.jwt = CachedJWTAuthentication()
+        self.token = TokenAuthentication()
+
+    def authenticate(self, request):
+        scheme = get_authorization_header(request).split(b" ", 1)[0]
+        if scheme in AUTH_HEADER_TYPE_BYTES:
+            return self.jwt.authenticate(request)
+        if scheme.lower() == self.token.keyword.lower().encode():
+            return self.token.authenticate(request)
+        return None
+
+    def authenticate_header(self, request):
+        return self.jwt.authenticate_header(request)
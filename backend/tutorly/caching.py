@@ -0,0 +1,204 @@
+import contextlib
+import contextvars
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+# Version keys: bumping one orphans every cache entry built on top of it
+CATALOG_VERSION_KEY = "tutorly:catalog:version"
+MODEL_VERSION_KEY = "tutorly:model:version"
+RATINGS_VERSION_KEY = "tutorly:ratings:version"  # Any rating/feedback write (course aggregates change)
+COLLABORATIVE_VERSION_KEY = "tutorly:collaborative:version"  # Committed rating writes, for the in-process item-item models
+
+
+def course_version_key(course_id):
+    return f"tutorly:course:{course_id}:version"
+
+
+def user_version_key(user_id):
+    return f"tutorly:user:{user_id}:version"
+
+
+def collaborative_delta_key(version):
+    """The rating writes that moved COLLABORATIVE_VERSION_KEY to ``version``."""
+    return f"tutorly:collaborative:delta:{version}"
+
+
+LOCAL_CACHE_MESSAGE = (
+    "The default cache is process-local (LocMemCache): version bumps from management commands "
+    "and other workers never reach the server, which keeps serving stale recommendations and "
+    "catalog pages. Point DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION at Redis or Memcached."
+)
+
+
+def cache_is_process_local():
+    return isinstance(caches["default"], LocMemCache)
+
+
+def require_shared_cache():
+    """Raise unless the version keys live in a cache every process shares; in DEBUG, return a warning instead."""
+    if not cache_is_process_local():
+        return None
+    if not settings.DEBUG:
+        raise ImproperlyConfigured(LOCAL_CACHE_MESSAGE)
+    return LOCAL_CACHE_MESSAGE
+
+
+def _fresh_version():
+    # Never restart at 1 after an eviction, or entries from an older generation could come back
+    return time.time_ns() // 1000
+
+
+def get_versions(*keys):
+    versions = cache.get_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*keys):
+    versions = await cache.aget_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def incr_version(key):
+    """Bump ``key`` once, right away, and return its new value."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+_bumps_suppressed = contextvars.ContextVar("tutorly_bumps_suppressed", default=False)
+
+
+@contextlib.contextmanager
+def suppress_version_bumps():
+    """Skip bump_version/bump_versions in this context, for writes that are rolled back anyway (benchmarks).
+
+    The version keys are shared, so a bump here would empty every cache on the live server.
+    """
+    token = _bumps_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _bumps_suppressed.reset(token)
+
+
+def bump_version(key):
+    """Bump now and again once the current transaction commits.
+
+    A read between the write and the commit sees the old rows under the first new version;
+    the second bump orphans whatever it cached or tagged, so it can't outlive the commit.
+    """
+    if _bumps_suppressed.get():
+        return
+    incr_version(key)
+    transaction.on_commit(lambda: incr_version(key))
+
+
+def bump_versions(*keys):
+    """Bump many keys in one round trip by dropping them (now and on commit); they are re-seeded from the clock on next read."""
+    if _bumps_suppressed.get():
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def versioned_etag(request, *keys):
+    """Strong ETag for a GET whose body depends only on the URL, the Accept header and ``keys``."""
+    return _etag(request, get_versions(*keys))
+
+
+async def aversioned_etag(request, *keys):
+    return _etag(request, await aget_versions(*keys))
+
+
+def _etag(request, versions):
+    accept = request.META.get("HTTP_ACCEPT", "")
+    gzipped = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")  # Each encoding needs its own strong ETag
+    digest = hashlib.sha1(f"{request.get_full_path()}|{accept}|{gzipped}|{versions}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def increment_counter(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def aincrement_counter(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def read_counters(*keys):
+    values = cache.get_many(keys)
+    return [values.get(key, 0) for key in keys]
+
+
+# ✅ Per-user recommend_courses responses
+RECOMMENDATION_HITS_KEY = "tutorly:stats:recommendations:hits"
+RECOMMENDATION_MISSES_KEY = "tutorly:stats:recommendations:misses"
+POPULAR_RECOMMENDATIONS_KEY = "tutorly:recommendations:popular"  # Load-shedding fallback for new users
+
+
+def recommendation_cache_key(user_id):
+    catalog, model, user = get_versions(CATALOG_VERSION_KEY, MODEL_VERSION_KEY, user_version_key(user_id))
+    return f"tutorly:recommendations:{user_id}:{catalog}:{model}:{user}"
+
+
+async def arecommendation_cache_key(user_id):
+    catalog, model, user = await aget_versions(CATALOG_VERSION_KEY, MODEL_VERSION_KEY, user_version_key(user_id))
+    return f"tutorly:recommendations:{user_id}:{catalog}:{model}:{user}"
+
+
+def get_cached_recommendations(cache_key):
+    payload = cache.get(cache_key)
+    increment_counter(RECOMMENDATION_HITS_KEY if payload is not None else RECOMMENDATION_MISSES_KEY)
+    return payload
+
+
+def last_recommendations_key(user_id):
+    # Unversioned copy of the latest list, served as the load-shedding fallback
+    return f"tutorly:recommendations:{user_id}:last"
+
+
+def set_cached_recommendations(cache_key, payload, user_id):
+    entries = {cache_key: payload, last_recommendations_key(user_id): payload}
+    cache.set_many(entries, timeout=getattr(settings, "RECOMMENDATION_CACHE_TIMEOUT", 60 * 60))
+
+
+async def aget_cached_recommendations(cache_key):
+    payload = await cache.aget(cache_key)
+    await aincrement_counter(RECOMMENDATION_HITS_KEY if payload is not None else RECOMMENDATION_MISSES_KEY)
+    return payload
+
+
+async def aset_cached_recommendations(cache_key, payload, user_id):
+    entries = {cache_key: payload, last_recommendations_key(user_id): payload}
+    await cache.aset_many(entries, timeout=getattr(settings, "RECOMMENDATION_CACHE_TIMEOUT", 60 * 60))
+
+
+def recommendation_cache_stats():
+    hits, misses = read_counters(RECOMMENDATION_HITS_KEY, RECOMMENDATION_MISSES_KEY)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 4) if total else None}
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.http import HttpRequest, HttpResponse, QueryDict
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .caching import CATALOG_VERSION_KEY, RATINGS_VERSION_KEY, aget_versions, get_versions
+from .models import Course
+from .pagination import CoursePagination
+from .renderers import FastJSONRenderer
+from .serializers import course_rows
+
+logger = logging.getLogger(__name__)
+
+GZIP_MIN_BYTES = 1024  # Smaller bodies don't shrink enough to be worth a Content-Encoding
+HOT_PAGES_LIMIT = 128  # First pages remembered for background re-rendering
+
+
+def catalog_page(request, filtered=True):
+    """Paginated catalog payload; ``filtered`` applies the ?min_rating= and ?category= filters."""
+    courses = Course.objects.all()
+    if filtered:
+        # ✅ Indexed filter on the stored average instead of an Avg() JOIN + GROUP BY
+        if min_rating := request.query_params.get("min_rating"):
+            courses = courses.filter(rating_avg__gte=min_rating)
+        if category := request.query_params.get("category"):
+            courses = courses.filter(category=category)
+
+    paginator = CoursePagination()
+    rows = course_rows()
+    page = paginator.paginate_queryset(rows.queryset(courses), request)
+    return paginator.get_paginated_response(rows.many(page)).data
+
+
+def render_entry(request, filtered):
+    body = FastJSONRenderer().render(catalog_page(request, filtered))
+    return {"body": body, "gzip": gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None}
+
+
+def _cache_key(scheme, host, path, query, filtered, versions):
+    # Pagination links are absolute, so the scheme and host are part of the rendered bytes
+    page = hashlib.sha1(f"{int(filtered)}:{scheme}://{host}{path}?{query}".encode()).hexdigest()
+    return f"tutorly:catalog:page:{versions[0]}:{versions[1]}:{page}"
+
+
+def _canonical_query(params, filtered):
+    names = {"cursor", "ordering", "page_size"} | ({"min_rating", "category"} if filtered else set())
+    return urlencode(sorted((name, value) for name, value in params.items() if name in names and value))
+
+
+# ✅ First pages served recently, re-rendered in the background after catalog/rating writes
+_hot_pages = OrderedDict()
+_hot_lock = threading.Lock()
+_rebuild_timer = None
+
+
+def _remember(page):
+    with _hot_lock:
+        _hot_pages[page] = True
+        _hot_pages.move_to_end(page)
+        while len(_hot_pages) > HOT_PAGES_LIMIT:
+            _hot_pages.popitem(last=False)
+
+
+def catalog_response(request, filtered=True):
+    """The catalog page as pre-rendered JSON bytes (gzip when accepted), shared by every user."""
+    if request.accepted_renderer.format != "json":
+        return Response(catalog_page(request, filtered))  # Browsable API
+
+    # A page rendered while a write is committing lands under a version the commit bumps again
+    # (caching.bump_version), so neither first nor cursor pages can outlive it
+    page, key = _page_key(request, filtered, get_versions(CATALOG_VERSION_KEY, RATINGS_VERSION_KEY))
+    entry = cache.get(key)
+    if entry is None:
+        entry = render_entry(request, filtered)
+        cache.set(key, entry, timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 24 * 60 * 60))
+    return _entry_response(request, page, entry)
+
+
+async def acatalog_response(request, filtered=True):
+    """``catalog_response`` for async views (JSON only); a cache hit never leaves the event loop."""
+    page, key = _page_key(request, filtered, await aget_versions(CATALOG_VERSION_KEY, RATINGS_VERSION_KEY))
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = await sync_to_async(render_entry)(request, filtered)
+        await cache.aset(key, entry, timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 24 * 60 * 60))
+    return _entry_response(request, page, entry)
+
+
+def _page_key(request, filtered, versions):
+    query = _canonical_query(request.query_params, filtered)
+    page = (request.scheme, request.get_host(), request.path, query, filtered)
+    return page, _cache_key(*page, versions)
+
+
+def _entry_response(request, page, entry):
+    if "cursor=" not in page[3]:
+        _remember(page)
+
+    if entry["gzip"] is not None and "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+        response = HttpResponse(entry["gzip"], content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(entry["body"], content_type="application/json")
+    response["Vary"] = "Accept, Accept-Encoding, Authorization"
+    return response
+
+
+class _RebuildRequest(HttpRequest):
+    def __init__(self, scheme, host, path, query):
+        super().__init__()
+        self.method = "GET"
+        self.path = self.path_info = path
+        self.META = {"HTTP_HOST": host, "QUERY_STRING": query}
+        self.GET = QueryDict(query)
+        self._scheme = scheme
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def rebuild_hot_pages():
+    """Render every remembered first page for the current versions. Returns the number rendered."""
+    with _hot_lock:
+        pages = list(_hot_pages)
+    versions = get_versions(CATALOG_VERSION_KEY, RATINGS_VERSION_KEY)
+    timeout = getattr(settings, "CATALOG_CACHE_TIMEOUT", 24 * 60 * 60)
+    for scheme, host, path, query, filtered in pages:
+        request = Request(_RebuildRequest(scheme, host, path, query))
+        cache.set(_cache_key(scheme, host, path, query, filtered, versions), render_entry(request, filtered), timeout)
+    return len(pages)
+
+
+def _rebuild_in_background():
+    try:
+        rebuild_hot_pages()
+    except Exception:
+        logger.exception("Catalog page rebuild failed")
+    finally:
+        connections.close_all()  # This thread's own connections
+
+
+def schedule_catalog_rebuild():
+    """Re-render hot catalog pages shortly after the current transaction commits.
+
+    Bursts of writes (e.g. a bulk rating upload) restart the delay, so they cost one rebuild.
+    """
+    delay = getattr(settings, "CATALOG_REBUILD_DELAY", 1.0)
+    if delay is None or not _hot_pages:
+        return
+
+    def start():
+        global _rebuild_timer
+        with _hot_lock:
+            if _rebuild_timer is not None:
+                _rebuild_timer.cancel()
+            _rebuild_timer = threading.Timer(delay, _rebuild_in_background)
+            _rebuild_timer.daemon = True
+            _rebuild_timer.start()
+
+    transaction.on_commit(start)
@@ -0,0 +1,14 @@
+from django.core.checks import Error, Warning, register
+
+from .caching import LOCAL_CACHE_MESSAGE, cache_is_process_local
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    # Tolerable for a single runserver process; never for several workers
+    return [Warning(LOCAL_CACHE_MESSAGE, id="tutorly.W001")] if cache_is_process_local() else []
+
+
+@register(deploy=True)
+def shared_cache_deploy_check(app_configs, **kwargs):
+    return [Error(LOCAL_CACHE_MESSAGE, id="tutorly.E001")] if cache_is_process_local() else []
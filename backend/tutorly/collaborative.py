@@ -0,0 +1,253 @@
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from django.core.cache import cache
+from django.db import transaction
+
+from .caching import COLLABORATIVE_VERSION_KEY, collaborative_delta_key, get_versions, incr_version
+from .models import Course
+from .recommender import last_rating_indices, load_rating_arrays, top_k_indices
+
+
+class ItemItemModel:
+    """In-memory user×course rating matrix with item-item cosine similarities.
+
+    ``gram`` holds the co-rating dot products (X.T @ X); cosine similarity is
+    ``gram[i, j] / (norm[i] * norm[j])``. Writes are folded in incrementally:
+    changing one rating only touches the gram rows of the courses that user
+    has rated, and the changes are buffered in a small delta matrix that is
+    merged into ``gram`` once it grows past ``COMPACT_THRESHOLD`` entries.
+    """
+
+    COMPACT_THRESHOLD = 50_000
+
+    def __init__(self, course_ids, user_ids=(), interaction_courses=(), ratings=()):
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.course_index = {int(course_id): i for i, course_id in enumerate(self.course_ids)}
+
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        interaction_courses = np.asarray(interaction_courses, dtype=np.int64)
+        ratings = np.asarray(ratings, dtype=np.float32)
+
+        known = np.array([course_id in self.course_index for course_id in interaction_courses.tolist()], dtype=bool)
+        user_ids, interaction_courses, ratings = user_ids[known], interaction_courses[known], ratings[known]
+
+        unique_users, rows = np.unique(user_ids, return_inverse=True)
+        self.user_ids = unique_users.tolist()
+        self.user_index = {int(user_id): i for i, user_id in enumerate(self.user_ids)}
+        cols = np.array([self.course_index[course_id] for course_id in interaction_courses.tolist()], dtype=np.int64)
+
+        # Keep only the last rating per (user, course), duplicates would otherwise be summed
+        n_courses = len(self.course_ids)
+        last = last_rating_indices(rows, cols)
+
+        self.matrix = sp.csr_matrix(
+            (ratings[last], (rows[last], cols[last])),
+            shape=(len(self.user_ids), n_courses),
+            dtype=np.float32,
+        )
+        self.gram = (self.matrix.T @ self.matrix).tocsr()
+        self.norms_sq = self.gram.diagonal().astype(np.float64)
+
+        self._overrides = {}
+        self._delta_rows, self._delta_cols, self._delta_vals = [], [], []
+        self._delta = None
+        self._lock = threading.Lock()
+        self.version = None  # COLLABORATIVE_VERSION_KEY value whose writes this model reflects
+
+    @classmethod
+    def build(cls):
+        course_ids = list(Course.objects.order_by("id").values_list("id", flat=True))
+        return cls(course_ids, *load_rating_arrays())
+
+    def knows_course(self, course_id):
+        return course_id in self.course_index
+
+    def _user_row(self, user_id):
+        u = self.user_index.get(user_id)
+        if u is None:
+            return {}
+        row = {}
+        if u < self.matrix.shape[0]:
+            start, end = self.matrix.indptr[u], self.matrix.indptr[u + 1]
+            row.update(zip(self.matrix.indices[start:end].tolist(), self.matrix.data[start:end].tolist()))
+        row.update(self._overrides.get(u, {}))
+        return {c: r for c, r in row.items() if r}
+
+    def update(self, user_id, course_id, rating):
+        """Apply one rating write (``rating=None`` removes it) to the model."""
+        c = self.course_index[course_id]
+        new = float(rating or 0)
+        with self._lock:
+            u = self.user_index.get(user_id)
+            if u is None:
+                u = self.user_index[user_id] = len(self.user_ids)
+                self.user_ids.append(user_id)
+
+            row = self._user_row(user_id)
+            old = row.get(c, 0.0)
+            diff = new - old
+            if diff == 0:
+                return
+
+            for j, value in row.items():
+                if j != c:
+                    self._delta_rows += [c, j]
+                    self._delta_cols += [j, c]
+                    self._delta_vals += [diff * value, diff * value]
+            self._delta_rows.append(c)
+            self._delta_cols.append(c)
+            self._delta_vals.append(new * new - old * old)
+            self.norms_sq[c] += new * new - old * old
+            self._overrides.setdefault(u, {})[c] = new
+            self._delta = None
+
+            if len(self._delta_vals) > self.COMPACT_THRESHOLD:
+                self._compact()
+
+    def _delta_matrix(self):
+        if self._delta is None:
+            n = len(self.course_ids)
+            self._delta = sp.csr_matrix(
+                (self._delta_vals, (self._delta_rows, self._delta_cols)), shape=(n, n), dtype=np.float32
+            )
+        return self._delta
+
+    def _compact(self):
+        self.gram = (self.gram + self._delta_matrix()).tocsr()
+        self.gram.eliminate_zeros()
+
+        matrix = self.matrix.tocoo()
+        rows, cols, data = matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist()
+        overridden = {(u, c) for u, row in self._overrides.items() for c in row}
+        kept = [i for i, key in enumerate(zip(rows, cols)) if key not in overridden]
+        rows = [rows[i] for i in kept]
+        cols = [cols[i] for i in kept]
+        data = [data[i] for i in kept]
+        for u, row in self._overrides.items():
+            for c, value in row.items():
+                if value:
+                    rows.append(u)
+                    cols.append(c)
+                    data.append(value)
+        self.matrix = sp.csr_matrix(
+            (data, (rows, cols)), shape=(len(self.user_ids), len(self.course_ids)), dtype=np.float32
+        )
+
+        self._overrides = {}
+        self._delta_rows, self._delta_cols, self._delta_vals = [], [], []
+        self._delta = None
+
+    def _inverse_norms(self):
+        norms = np.sqrt(np.clip(self.norms_sq, 0, None))
+        return np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+    def similarity_rows(self, rows):
+        """Dense cosine similarities of the courses at ``rows`` against every course."""
+        with self._lock:
+            inverse = self._inverse_norms()
+            block = (self.gram[rows] + self._delta_matrix()[rows]).toarray()
+        return block * inverse[rows][:, None] * inverse
+
+    def recommend(self, user_id, k=5, exclude=()):
+        """Top-k unseen course ids for a user, scored by one sparse similarity product."""
+        with self._lock:
+            row = self._user_row(user_id)
+            if not row:
+                return []
+
+            inverse = self._inverse_norms()
+            profile = np.zeros(len(self.course_ids))
+            profile[list(row)] = list(row.values())
+            weighted = profile * inverse
+            scores = (self.gram @ weighted + self._delta_matrix() @ weighted) * inverse
+
+        scores[list(row)] = -np.inf
+        excluded = [self.course_index[course_id] for course_id in exclude if course_id in self.course_index]
+        scores[excluded] = -np.inf
+        best = top_k_indices(scores, k)
+        return [int(self.course_ids[i]) for i in best if scores[i] > 0]
+
+
+# ✅ Process-level model, updated in place by committed rating writes. Every committed
+# batch bumps COLLABORATIVE_VERSION_KEY and logs its writes under the new version, so a
+# model that missed bumps (writes from other processes) replays them from the log; it is
+# rebuilt only when the log has a gap or it fell more than MAX_CATCH_UP versions behind.
+MAX_CATCH_UP = 1000
+DELTA_TIMEOUT = 60 * 60
+
+_collaborative_model = None
+_collaborative_lock = threading.Lock()
+
+
+def _catch_up(model, version):
+    """Replay the logged writes between ``model.version`` and ``version``; False if they're not all there."""
+    if model.version is None or not 0 < version - model.version <= MAX_CATCH_UP:
+        return False
+    keys = [collaborative_delta_key(v) for v in range(model.version + 1, version + 1)]
+    deltas = cache.get_many(keys)
+    if len(deltas) != len(keys):
+        return False  # Evicted, not written yet, or a full invalidation
+    for key in keys:
+        if not all(model.knows_course(course_id) for _, course_id, _ in deltas[key]):
+            return False
+        # Updates are idempotent, so writes this process already applied are harmless
+        for user_id, course_id, rating in deltas[key]:
+            model.update(user_id, course_id, rating)
+    model.version = version
+    return True
+
+
+def get_collaborative_model():
+    global _collaborative_model
+    (version,) = get_versions(COLLABORATIVE_VERSION_KEY)
+    model = _collaborative_model
+    if model is not None and model.version == version:
+        return model
+
+    with _collaborative_lock:
+        (version,) = get_versions(COLLABORATIVE_VERSION_KEY)
+        model = _collaborative_model
+        if model is None or (model.version != version and not _catch_up(model, version)):
+            # Read the version first: a write committing during the build bumps it again
+            model = ItemItemModel.build()
+            model.version = version
+            _collaborative_model = model
+        return model
+
+
+def record_rating(user_id, course_id, rating):
+    """Fold a saved/deleted Interaction into the live model once its transaction commits."""
+    record_ratings([(user_id, course_id, rating)])
+
+
+def record_ratings(changes):
+    """``record_rating`` for many ``(user_id, course_id, rating)`` writes, with one version bump."""
+    changes = [
+        (user_id, course_id, int(rating) if rating not in (None, "") else None)
+        for user_id, course_id, rating in changes
+    ]
+    # A rolled-back write never reaches the model
+    transaction.on_commit(lambda: _apply_ratings(changes))
+
+
+def _apply_ratings(changes):
+    model = _collaborative_model
+    if model is not None and all(model.knows_course(course_id) for _, course_id, _ in changes):
+        for user_id, course_id, rating in changes:
+            model.update(user_id, course_id, rating)
+    else:
+        model = None  # A course the model doesn't have: it's rebuilt on next use
+    version = incr_version(COLLABORATIVE_VERSION_KEY)
+    cache.set(collaborative_delta_key(version), changes, timeout=DELTA_TIMEOUT)
+    # Still current only if no other write was committed since the model's version
+    if model is not None and model.version is not None and model.version + 1 == version:
+        model.version = version
+
+
+def invalidate_collaborative_model():
+    """Rebuild the model on next use, in every process (the bump has no logged writes)."""
+    global _collaborative_model
+    _collaborative_model = None
+    incr_version(COLLABORATIVE_VERSION_KEY)
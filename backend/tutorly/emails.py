@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+def queue_email(subject, body, recipients, from_email=None):
+    """Record an email in the outbox; the request never waits on SMTP."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+    )
+
+
+def claim_batch(batch_size, lease_seconds):
+    """Take up to ``batch_size`` due emails and push their next attempt out by a lease.
+
+    The lease keeps other workers (and a restarted one) off the same rows while
+    they are being sent; if this worker dies, they simply become due again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(id__in=[email.id for email in batch]).update(
+                next_attempt_at=now + timedelta(seconds=lease_seconds)
+            )
+    return batch
+
+
+class OutboxSender:
+    """Delivers outbox rows over one reused mail connection."""
+
+    def __init__(self, max_attempts=5, backoff_seconds=60, lease_seconds=300):
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.lease_seconds = lease_seconds
+        self.connection = None
+
+    def _connection(self):
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+            self.connection.open()
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            finally:
+                self.connection = None
+
+    def send_batch(self, batch_size=50):
+        """Send one batch of due emails. Returns (sent, failed) counts.
+
+        Each outcome is written as soon as that message is done, so an error or an
+        interrupt later in the batch can't get already-delivered messages sent again.
+        """
+        batch = claim_batch(batch_size, self.lease_seconds)
+        sent = failed = 0
+
+        for email in batch:
+            try:
+                EmailMessage(
+                    email.subject, email.body, email.from_email or None, email.recipients,
+                    connection=self._connection(),
+                ).send()
+            except Exception as exc:
+                # A broken session is reopened for the next message
+                self.close()
+                email.attempts += 1
+                email.last_error = f"{type(exc).__name__}: {exc}"
+                if email.attempts >= self.max_attempts:
+                    email.status = OutboundEmail.STATUS_FAILED
+                else:
+                    # Exponential backoff: 1×, 2×, 4×, ... the base delay
+                    delay = self.backoff_seconds * 2 ** (email.attempts - 1)
+                    email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+                email.save(update_fields=["status", "attempts", "next_attempt_at", "last_error"])
+                failed += 1
+            else:
+                email.attempts += 1
+                email.status = OutboundEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                email.save(update_fields=["status", "attempts", "sent_at", "last_error"])
+                sent += 1
+        return sent, failed
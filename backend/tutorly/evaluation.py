@@ -0,0 +1,226 @@
+import numpy as np
+
+from .collaborative import ItemItemModel
+from .exports import rating_columns
+from .factorization import FactorModel, train_als
+from .recommender import ContentModel, last_rating_indices
+from .views import bad_rated_course_ids, rank_content, rank_rated
+
+RECOMMENDERS = ("popular", "content", "item_item", "als", "hybrid")
+
+
+def load_ratings():
+    """Every user's latest rating per course, as id/user_id/course_id/rating arrays sorted by id."""
+    columns = rating_columns()
+    last = last_rating_indices(columns["user_id"], columns["course_id"])
+    return {name: values[last] for name, values in columns.items()}
+
+
+def holdout_split(user_ids, order_keys, holdout=1, min_train=1):
+    """Boolean test mask holding out each user's ``holdout`` rows with the largest ``order_keys``.
+
+    Users with fewer than ``holdout + min_train`` rows are kept entirely in training.
+    Pass interaction ids as keys for a "most recent" split, or random floats for a random one.
+    """
+    order = np.lexsort((order_keys, user_ids))
+    sorted_users = user_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_users[1:] != sorted_users[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    position = np.arange(len(order)) - np.repeat(starts, counts)
+    count = np.repeat(counts, counts)
+
+    test = np.zeros(len(order), dtype=bool)
+    test[order] = (count >= holdout + min_train) & (position >= count - holdout)
+    return test
+
+
+class OfflineModels:
+    """Every recommender, fitted on the training ratings only."""
+
+    def __init__(self, course_ids, users, courses, ratings, content=None, recommenders=RECOMMENDERS,
+                 factors=32, iterations=10, regularization=0.05, workers=1, seed=0, factor_model=None):
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.course_index = {int(course_id): i for i, course_id in enumerate(self.course_ids)}
+        self.content = content if content is not None else ContentModel.build()
+
+        counts = np.bincount(np.searchsorted(self.course_ids, courses), minlength=len(self.course_ids))
+        self.popular_ids = self.course_ids[np.argsort(-counts, kind="stable")].tolist()
+
+        self.item_item = None
+        if {"item_item", "hybrid"} & set(recommenders):
+            self.item_item = ItemItemModel(self.course_ids, users, courses, ratings)
+
+        self.factors = factor_model  # Already fitted on these training ratings, if given
+        if self.factors is None and {"als", "hybrid"} & set(recommenders) and len(ratings):
+            unique_users, rows = np.unique(users, return_inverse=True)
+            cols = np.searchsorted(self.course_ids, courses)
+            trained = train_als(
+                rows, cols, ratings, len(unique_users), len(self.course_ids),
+                factors=factors, iterations=iterations, regularization=regularization, workers=workers, seed=seed,
+            )
+            self.factors = FactorModel("offline", unique_users, self.course_ids, *trained)
+
+    def recommend(self, name, user_id, train, k):
+        """Top-k unseen course ids for a user whose training ratings are ``{course_id: rating}``.
+
+        "hybrid" is the served list, which starts with the user's highly rated courses.
+        """
+        seen = set(train)
+        if name == "popular":
+            return [course_id for course_id in self.popular_ids if course_id not in seen][:k]
+        if name == "content":
+            liked = [course_id for course_id, rating in train.items() if rating >= 4]
+            return self.content.recommend(liked, exclude=seen, k=k)
+        if name == "item_item":
+            return self.item_item.recommend(user_id, k=k, exclude=seen)
+        if name == "als":
+            if self.factors is None or not self.factors.knows_user(user_id):
+                return []
+            return self.factors.recommend(user_id, k=k, exclude=seen)
+        if name == "hybrid":
+            return self.hybrid(user_id, train, k)
+        raise ValueError(f"Unknown recommender {name!r}")
+
+    def hybrid(self, user_id, train, k):
+        """``views.recommend_course_ids`` on the training ratings, through the same ranking functions.
+
+        Only enrollments are missing: the content fallback sees the user's ratings alone.
+        """
+        user_ratings = list(train.items())
+        if not user_ratings:
+            return rank_content(self.content, user_ratings, [], k)
+        if not set(self.course_index) - bad_rated_course_ids(user_ratings):
+            return []  # No good courses left
+        # Same choice as views.collaborative_model
+        if self.factors is not None and self.factors.knows_user(user_id):
+            collaborative = self.factors
+        else:
+            collaborative = self.item_item
+        recommendations = rank_rated(collaborative, user_id, user_ratings, k)
+        if recommendations:
+            return recommendations
+        return rank_content(self.content, user_ratings, [], k)
+
+
+def ranking_metrics(recommended, relevant, k):
+    """(precision@k, recall@k, ndcg@k, hit) for one user with binary relevance."""
+    hits = np.array([course_id in relevant for course_id in recommended[:k]], dtype=bool)
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = float(discounts[:len(hits)][hits].sum())
+    ideal = float(discounts[:min(len(relevant), k)].sum())
+    n_hits = int(hits.sum())
+    return n_hits / k, n_hits / len(relevant), dcg / ideal if ideal else 0.0, n_hits > 0
+
+
+class MetricTotals:
+    """Running sums for one recommender, mergeable across worker processes."""
+
+    def __init__(self, n_courses):
+        self.users = 0
+        self.precision = self.recall = self.ndcg = 0.0
+        self.hits = 0
+        self.covered = np.zeros(n_courses, dtype=bool)
+
+    def add(self, recommended_rows, precision, recall, ndcg, hit):
+        self.users += 1
+        self.precision += precision
+        self.recall += recall
+        self.ndcg += ndcg
+        self.hits += hit
+        self.covered[recommended_rows] = True
+
+    def merge(self, other):
+        self.users += other.users
+        self.precision += other.precision
+        self.recall += other.recall
+        self.ndcg += other.ndcg
+        self.hits += other.hits
+        self.covered |= other.covered
+
+    def report(self, k):
+        users = max(self.users, 1)
+        return {
+            "users": self.users,
+            f"precision@{k}": round(self.precision / users, 4),
+            f"recall@{k}": round(self.recall / users, 4),
+            f"ndcg@{k}": round(self.ndcg / users, 4),
+            "hit_rate": round(self.hits / users, 4),
+            "coverage": round(float(self.covered.mean()) if len(self.covered) else 0.0, 4),
+        }
+
+
+def evaluate_users(models, user_ids, train, test, recommenders, k):
+    """Score ``recommenders`` for each user. ``train``/``test`` map user id -> {course_id: rating}."""
+    totals = {name: MetricTotals(len(models.course_ids)) for name in recommenders}
+    for user_id in user_ids:
+        relevant = set(test[user_id])
+        for name in recommenders:
+            # The served hybrid list can run past k: rated favourites come before the picks
+            recommended = models.recommend(name, user_id, train.get(user_id, {}), k)[:k]
+            rows = [models.course_index[course_id] for course_id in recommended]
+            totals[name].add(rows, *ranking_metrics(recommended, relevant, k))
+    return totals
+
+
+def ratings_by_user(users, courses, ratings):
+    """``{user_id: {course_id: rating}}`` from parallel arrays."""
+    order = np.argsort(users, kind="stable")
+    users, courses, ratings = users[order], courses[order].tolist(), ratings[order].tolist()
+    unique_users, starts = np.unique(users, return_index=True)
+    ends = np.r_[starts[1:], len(users)]
+    return {
+        int(user_id): dict(zip(courses[start:end], ratings[start:end]))
+        for user_id, start, end in zip(unique_users, starts, ends)
+    }
+
+
+def validate_factor_model(ratings, course_ids, regularizations, k=5, relevance_threshold=4, max_users=None,
+                          factors=32, iterations=10, workers=1, seed=0):
+    """Hold out each user's latest rating, pick the regularisation with the lowest held-out RMSE,
+    and compare that model with item-item on recall@k.
+
+    ``ratings`` is ``load_ratings()`` output. The factor model passes only if it beats both the
+    global-mean RMSE and item-item's recall@k; the report says which test it failed.
+    """
+    test = holdout_split(ratings["user_id"], ratings["id"])
+    train = ~test
+    users, courses, values = ratings["user_id"][train], ratings["course_id"][train], ratings["rating"][train]
+    held_users, held_courses = ratings["user_id"][test], ratings["course_id"][test]
+    held_ratings = ratings["rating"][test].astype(np.float64)
+
+    unique_users, rows = np.unique(users, return_inverse=True)
+    cols = np.searchsorted(course_ids, courses)
+    baseline_rmse = float(np.sqrt(np.mean((held_ratings - float(values.mean())) ** 2)))
+
+    candidates = {}
+    for regularization in regularizations:
+        model = FactorModel("validation", unique_users, course_ids, *train_als(
+            rows, cols, values, len(unique_users), len(course_ids), factors=factors, iterations=iterations,
+            regularization=regularization, workers=workers, seed=seed,
+        ))
+        error = float(np.sqrt(np.mean((held_ratings - model.predict(held_users, held_courses)) ** 2)))
+        candidates[regularization] = (error, model)
+    regularization = min(candidates, key=lambda value: candidates[value][0])
+    best_rmse, best = candidates[regularization]
+
+    relevant = held_ratings >= relevance_threshold
+    test_by_user = ratings_by_user(held_users[relevant], held_courses[relevant], ratings["rating"][test][relevant])
+    eval_users = np.array(sorted(test_by_user), dtype=np.int64)
+    if max_users and len(eval_users) > max_users:
+        eval_users = np.sort(np.random.default_rng(seed).choice(eval_users, size=max_users, replace=False))
+    models = OfflineModels(course_ids, users, courses, values, content=ContentModel([]),
+                           recommenders=("item_item", "als"), factor_model=best)
+    totals = evaluate_users(models, eval_users, ratings_by_user(users, courses, values), test_by_user,
+                            ("item_item", "als"), k)
+    recall = {name: totals[name].report(k)[f"recall@{k}"] for name in totals}
+
+    return {
+        "regularization": regularization,
+        "rmse": {"als": round(best_rmse, 4), "global_mean": round(baseline_rmse, 4)},
+        "rmse_by_regularization": {str(value): round(error, 4) for value, (error, _) in candidates.items()},
+        f"recall@{k}": recall,
+        "users": len(eval_users),
+        "beats_global_mean": best_rmse < baseline_rmse,
+        "beats_item_item": recall["als"] > recall["item_item"],
+        "passed": best_rmse < baseline_rmse and recall["als"] > recall["item_item"],
+    }
@@ -0,0 +1,138 @@
+import io
+import json
+import zipfile
+
+import numpy as np
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .models import Course, Interaction
+from .serializers import course_rows
+
+EXPORT_CHUNK_SIZE = 5000
+# Output name -> column: InteractionSerializer's fields (user/course as their string form), plus the raw ids
+INTERACTION_EXPORT_FIELDS = {
+    "id": "id",
+    "user": "user__username",
+    "course": "course__title",
+    "user_id": "user_id",
+    "course_id": "course_id",
+    "rating": "rating",
+    "feedback": "feedback",
+}
+RATING_COLUMNS = ("id", "user_id", "course_id", "rating")
+
+
+def _ndjson_records():
+    # Same course fields as CourseSerializer, read from plain rows
+    serializer = course_rows()
+    for row in serializer.queryset(Course.objects.order_by("id")).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {"type": "course", **serializer.to_representation(row)}
+    names = tuple(INTERACTION_EXPORT_FIELDS)
+    rows = (
+        Interaction.objects.order_by("id")
+        .values_list(*INTERACTION_EXPORT_FIELDS.values())
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for row in rows:
+        yield {"type": "interaction", **dict(zip(names, row))}
+
+
+def _ndjson_chunks():
+    # One write per chunk of lines rather than per row
+    lines = []
+    for record in _ndjson_records():
+        lines.append(json.dumps(record))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def ndjson_response():
+    """Courses then interactions, one JSON object per line, streamed in DB-sized chunks."""
+    response = StreamingHttpResponse(_ndjson_chunks(), content_type="application/x-ndjson")
+    response["Content-Disposition"] = 'attachment; filename="recommendation_data.ndjson"'
+    return response
+
+
+def rating_columns():
+    """Rated interactions as parallel NumPy arrays, filled straight from a chunked cursor."""
+    rows = (
+        Interaction.objects.exclude(rating=None)
+        .order_by("id")
+        .values_list(*RATING_COLUMNS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    flat = np.fromiter((value for row in rows for value in row), dtype=np.int64).reshape(-1, 4)
+    return {
+        "id": flat[:, 0],
+        "user_id": flat[:, 1],
+        "course_id": flat[:, 2],
+        "rating": flat[:, 3].astype(np.float32),
+    }
+
+
+class _Drain:
+    """Write-only file object whose bytes are handed out as they are written."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _npz_chunks(columns):
+    # np.savez_compressed's layout (one deflated .npy per array), written member by member and
+    # slice by slice, so the file itself is never held in memory
+    drain = _Drain()
+    with zipfile.ZipFile(drain, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, array in columns.items():
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array_header_1_0(member, np.lib.format.header_data_from_array_1_0(array))
+                for start in range(0, len(array), EXPORT_CHUNK_SIZE * 20):
+                    member.write(array[start:start + EXPORT_CHUNK_SIZE * 20].tobytes())
+                    chunk = drain.take()
+                    if chunk:  # The compressor holds on to small writes
+                        yield chunk
+    yield drain.take()  # The rest of the last member and the central directory
+
+
+def npz_response():
+    """The rating columns as a compressed .npz, streamed as it is compressed.
+
+    The arrays themselves are built in memory first (see ``rating_columns``).
+    """
+    response = StreamingHttpResponse(_npz_chunks(rating_columns()), content_type="application/octet-stream")
+    response["Content-Disposition"] = 'attachment; filename="ratings.npz"'
+    return response
+
+
+def parquet_response():
+    """The rating columns as Parquet. Unlike the other formats this one is fully buffered:
+    pandas writes the whole file into memory before the response is sent.
+    """
+    # pandas needs pyarrow (or fastparquet) for Parquet; neither is a hard dependency
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    pd.DataFrame(rating_columns()).to_parquet(buffer, index=False)
+    response = HttpResponse(buffer.getvalue(), content_type="application/vnd.apache.parquet")
+    response["Content-Disposition"] = 'attachment; filename="ratings.parquet"'
+    return response
+
+
+EXPORTERS = {
+    "ndjson": ndjson_response,
+    "npz": npz_response,
+    "parquet": parquet_response,
+}
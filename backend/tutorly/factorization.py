@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from django.conf import settings
+from django.utils import timezone
+
+from .recommender import top_k_indices
+
+ARTIFACT_FORMAT = 2  # 2: biases, and only written once evaluation beats item-item
+
+
+def artifact_dir():
+    return Path(getattr(settings, "RECOMMENDER_ARTIFACT_DIR", settings.BASE_DIR / "artifacts" / "recommender"))
+
+
+def _segments(owners, n_owners, max_rows):
+    """Split rows sorted by owner into contiguous blocks of roughly ``max_rows`` ratings."""
+    counts = np.bincount(owners, minlength=n_owners)
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    blocks, first = [], 0
+    while first < n_owners:
+        last = int(np.searchsorted(starts, starts[first] + max_rows, side="right")) - 1
+        last = min(max(last, first + 1), n_owners)
+        blocks.append((first, last))
+        first = last
+    return starts, blocks
+
+
+def _solve_block(first, last, starts, others, values, fixed, current, regularization, cg_steps):
+    """Batched conjugate-gradient ALS update for owners [first, last) with the other side fixed.
+
+    Each owner solves (Σ y yᵀ + λ·n I) x = Σ r y, but the k×k matrices are never
+    formed: CG only needs products A·p, which cost O(ratings · k) instead of
+    O(ratings · k²). Warm-starting from the previous factors means a few steps
+    per iteration are enough.
+    """
+    lo, hi = starts[first], starts[last]
+    counts = np.diff(starts[first:last + 1])
+    x = current[first:last].copy()
+    rated = np.flatnonzero(counts)
+    if hi == lo:
+        return first, x
+
+    y = fixed[others[lo:hi]]
+    owner = np.repeat(np.arange(len(rated)), counts[rated])
+    # Ratings are sorted by owner, so a CSR indicator matrix sums each owner's run in one SpMM
+    indptr = np.concatenate([[0], np.cumsum(counts[rated])])
+    segments = sp.csr_matrix(
+        (np.ones(hi - lo, dtype=y.dtype), np.arange(hi - lo), indptr), shape=(len(rated), hi - lo)
+    )
+    damping = (regularization * counts[rated])[:, None].astype(y.dtype)
+
+    def apply(p):
+        dots = np.einsum("ij,ij->i", y, p[owner])
+        return segments @ (y * dots[:, None]) + damping * p
+
+    solution = x[rated]
+    residual = segments @ (y * values[lo:hi, None]) - apply(solution)
+    direction = residual.copy()
+    residual_sq = np.einsum("ij,ij->i", residual, residual)
+    for _ in range(cg_steps):
+        projected = apply(direction)
+        curvature = np.einsum("ij,ij->i", direction, projected)
+        alpha = np.divide(residual_sq, curvature, out=np.zeros_like(residual_sq), where=curvature > 0)
+        solution += alpha[:, None] * direction
+        residual -= alpha[:, None] * projected
+        next_sq = np.einsum("ij,ij->i", residual, residual)
+        beta = np.divide(next_sq, residual_sq, out=np.zeros_like(next_sq), where=residual_sq > 0)
+        direction = residual + beta[:, None] * direction
+        residual_sq = next_sq
+
+    x[rated] = solution
+    return first, x
+
+
+def _als_half_step(owners, others, values, n_owners, fixed, current, regularization, workers, block_rows, cg_steps):
+    order = np.argsort(owners, kind="stable")
+    owners, others, values = owners[order], others[order], values[order]
+    starts, blocks = _segments(owners, n_owners, block_rows)
+
+    factors = np.zeros_like(current)
+    # NumPy releases the GIL inside these vectorised kernels, so plain threads scale across cores
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        jobs = [
+            pool.submit(_solve_block, first, last, starts, others, values, fixed, current, regularization, cg_steps)
+            for first, last in blocks
+        ]
+        for job in jobs:
+            first, block = job.result()
+            factors[first:first + len(block)] = block
+    return factors
+
+
+def train_als(rows, cols, ratings, n_users, n_items, factors=32, regularization=0.05,
+              iterations=10, workers=1, seed=0, cg_steps=3, callback=None):
+    """Explicit-feedback ALS with user and course biases: r ≈ mean + b_u + b_i + x_u·y_i.
+
+    Each half-step solves [x_u, b_u] against [y_i, 1] (and vice versa), so the biases
+    come out of the same regularised solves as the factors.
+    Returns (user_factors, item_factors, mean, user_bias, item_bias).
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    ratings = np.asarray(ratings, dtype=np.float32)
+    mean = float(ratings.mean()) if len(ratings) else 0.0
+    residuals = ratings - mean
+
+    # At most ~1M ratings per block, and at least one block per worker
+    block_rows = max(1, min(1_000_000, -(-len(ratings) // max(workers, 1))))
+    user_factors = (rng.standard_normal((n_users, factors)) * 0.1).astype(np.float32)
+    item_factors = (rng.standard_normal((n_items, factors)) * 0.1).astype(np.float32)
+    user_bias = np.zeros(n_users, dtype=np.float32)
+    item_bias = np.zeros(n_items, dtype=np.float32)
+    user_ones = np.ones((n_users, 1), dtype=np.float32)
+    item_ones = np.ones((n_items, 1), dtype=np.float32)
+
+    for iteration in range(iterations):
+        solved = _als_half_step(rows, cols, residuals - item_bias[cols], n_users,
+                                np.hstack([item_factors, item_ones]), np.hstack([user_factors, user_bias[:, None]]),
+                                regularization, workers, block_rows, cg_steps)
+        user_factors, user_bias = np.ascontiguousarray(solved[:, :-1]), np.ascontiguousarray(solved[:, -1])
+        solved = _als_half_step(cols, rows, residuals - user_bias[rows], n_items,
+                                np.hstack([user_factors, user_ones]), np.hstack([item_factors, item_bias[:, None]]),
+                                regularization, workers, block_rows, cg_steps)
+        item_factors, item_bias = np.ascontiguousarray(solved[:, :-1]), np.ascontiguousarray(solved[:, -1])
+        if callback is not None:
+            callback(iteration, rmse(rows, cols, residuals, user_factors, item_factors, user_bias, item_bias))
+
+    return user_factors, item_factors, mean, user_bias, item_bias
+
+
+def rmse(rows, cols, residuals, user_factors, item_factors, user_bias=None, item_bias=None, chunk=1_000_000):
+    """RMSE of mean-centred ``residuals`` against the factor (and bias) predictions."""
+    if not len(residuals):
+        return 0.0
+    total = 0.0
+    for start in range(0, len(residuals), chunk):
+        end = start + chunk
+        predicted = np.einsum("ij,ij->i", user_factors[rows[start:end]], item_factors[cols[start:end]])
+        if user_bias is not None:
+            predicted += user_bias[rows[start:end]] + item_bias[cols[start:end]]
+        total += float(np.sum((residuals[start:end] - predicted) ** 2))
+    return float(np.sqrt(total / len(residuals)))
+
+
+class FactorModel:
+    """Trained latent factors and biases loaded from a versioned artifact."""
+
+    def __init__(self, version, user_ids, course_ids, user_factors, item_factors, mean, user_bias=None, item_bias=None):
+        self.version = version
+        self.user_index = {int(user_id): i for i, user_id in enumerate(user_ids)}
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.course_index = {int(course_id): i for i, course_id in enumerate(self.course_ids)}
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.mean = mean
+        self.user_bias = user_bias if user_bias is not None else np.zeros(len(user_factors), dtype=np.float32)
+        self.item_bias = item_bias if item_bias is not None else np.zeros(len(item_factors), dtype=np.float32)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as artifact:
+            return cls(
+                str(artifact["version"]),
+                artifact["user_ids"],
+                artifact["course_ids"],
+                artifact["user_factors"],
+                artifact["item_factors"],
+                float(artifact["mean"]),
+                artifact["user_bias"],
+                artifact["item_bias"],
+            )
+
+    def knows_user(self, user_id):
+        return user_id in self.user_index
+
+    def predict(self, user_ids, course_ids):
+        """Predicted ratings for parallel id arrays; unknown users/courses get the biases they have."""
+        users = np.array([self.user_index.get(int(user_id), -1) for user_id in user_ids], dtype=np.int64)
+        items = np.array([self.course_index.get(int(course_id), -1) for course_id in course_ids], dtype=np.int64)
+        known_user, known_item = users >= 0, items >= 0
+        predicted = np.full(len(users), self.mean, dtype=np.float64)
+        predicted[known_user] += self.user_bias[users[known_user]]
+        predicted[known_item] += self.item_bias[items[known_item]]
+        both = known_user & known_item
+        predicted[both] += np.einsum("ij,ij->i", self.user_factors[users[both]], self.item_factors[items[both]])
+        return predicted
+
+    def recommend(self, user_id, k=5, exclude=()):
+        """Score every course with one factor dot product and return the top-k ids."""
+        u = self.user_index[user_id]
+        scores = self.item_factors @ self.user_factors[u] + self.item_bias + (self.mean + self.user_bias[u])
+        excluded = [self.course_index[course_id] for course_id in exclude if course_id in self.course_index]
+        scores[excluded] = -np.inf
+        best = top_k_indices(scores, k)
+        return [int(self.course_ids[i]) for i in best if np.isfinite(scores[i])]
+
+
+def save_artifact(user_ids, course_ids, user_factors, item_factors, mean, user_bias, item_bias,
+                  metadata=None, directory=None):
+    """Write a new versioned artifact and point ``latest.json`` at it."""
+    directory = Path(directory or artifact_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    version = timezone.now().strftime("%Y%m%d%H%M%S%f")
+    path = directory / f"als-{version}.npz"
+
+    np.savez(
+        path,
+        version=np.array(version),
+        user_ids=np.asarray(user_ids, dtype=np.int64),
+        course_ids=np.asarray(course_ids, dtype=np.int64),
+        user_factors=user_factors,
+        item_factors=item_factors,
+        mean=np.array(mean),
+        user_bias=user_bias,
+        item_bias=item_bias,
+    )
+
+    pointer = {"format": ARTIFACT_FORMAT, "version": version, "path": path.name, **(metadata or {})}
+    tmp = directory / "latest.json.tmp"
+    tmp.write_text(json.dumps(pointer, indent=2))
+    os.replace(tmp, directory / "latest.json")
+    return path
+
+
+# ✅ Latest artifact, reloaded when latest.json is replaced by a new training run
+_factor_model = None
+_factor_stamp = None
+_factor_lock = threading.Lock()
+
+
+def get_factor_model():
+    global _factor_model, _factor_stamp
+    pointer = artifact_dir() / "latest.json"
+    try:
+        stamp = pointer.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if stamp == _factor_stamp:
+        return _factor_model
+
+    with _factor_lock:
+        if stamp != _factor_stamp:
+            latest = json.loads(pointer.read_text())
+            # Only artifacts that passed train_recommender's evaluation against item-item are served
+            if latest.get("format") == ARTIFACT_FORMAT and latest.get("evaluation", {}).get("passed"):
+                _factor_model = FactorModel.load(pointer.parent / latest["path"])
+            else:
+                _factor_model = None
+            _factor_stamp = stamp
+    return _factor_model
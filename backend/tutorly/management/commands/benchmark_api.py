@@ -0,0 +1,137 @@
+import json
+import platform
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from tutorly.benchmarking import measure, rolled_back
+from tutorly.caching import recommendation_cache_key
+from tutorly.models import Course, Interaction
+from tutorly.throttling import bucket_settings
+
+
+class Command(BaseCommand):
+    help = "Time the API hot paths in-process and print p50/p95/p99, query counts and peak memory as JSON."
+
+    scenarios = (
+        "recommend_courses",
+        "recommend_courses_cached",
+        "course_search",
+        "course_min_rating",
+        "rate_course",
+        "update_progress",
+        "recommendation_data",
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--username", help="User to benchmark as (default: the most active user).")
+        parser.add_argument("--search", default="python", help="Search term for course_search.")
+        parser.add_argument("--min-rating", type=float, default=3.5)
+        parser.add_argument("--only", nargs="+", choices=self.scenarios, help="Run just these scenarios.")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        user = self.pick_user(options["username"])
+        course_ids = list(Course.objects.values_list("id", flat=True))
+        if not course_ids:
+            raise CommandError("No courses; load some with `manage.py seed_synthetic` first.")
+        self.rng = np.random.default_rng(options["seed"])
+        self.course_ids = course_ids
+
+        # ✅ Full middleware/DRF stack, minus JWT decoding
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        self.user = user
+
+        results = {}
+        # Every scenario calls as one user, far faster than any per-user token bucket allows
+        with override_settings(TOKEN_BUCKET={**bucket_settings(), "ENABLED": False}):
+            for name in options["only"] or self.scenarios:
+                self.stderr.write(f"Running {name}...")
+                call, before, writes = self.scenario(name, options)
+                if writes:
+                    # ✅ Writing scenarios leave no rows (and no version bumps) behind
+                    results[name] = rolled_back(measure, call, options["iterations"], options["warmup"], before)
+                else:
+                    results[name] = measure(call, options["iterations"], options["warmup"], before)
+
+        report = {
+            "meta": {
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "user": user.username,
+                "users": User.objects.count(),
+                "courses": len(course_ids),
+                "interactions": Interaction.objects.count(),
+                "iterations": options["iterations"],
+            },
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        self.stdout.write(output)
+
+    def pick_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {username!r}.")
+        user = User.objects.annotate(n=Count("interaction")).order_by("-n").first()
+        if user is None:
+            raise CommandError("No users; load some with `manage.py seed_synthetic` first.")
+        return user
+
+    def get(self, path, streaming=False):
+        def call():
+            response = self.client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+            if streaming:
+                for _ in response.streaming_content:
+                    pass
+        return call
+
+    def random_course(self):
+        return self.course_ids[int(self.rng.integers(len(self.course_ids)))]
+
+    def scenario(self, name, options):
+        """Returns ``(call, before, writes)`` for a scenario name."""
+        if name == "recommend_courses":
+            # Drop only this user's entry: the cache may be shared with a live server
+            return self.get("/api/recommend_courses/"), self.drop_cached_recommendations, False
+        if name == "recommend_courses_cached":
+            return self.get("/api/recommend_courses/"), None, False
+        if name == "course_search":
+            return self.get(f"/api/courses/?search={options['search']}&min_rating={options['min_rating']}"), None, False
+        if name == "course_min_rating":
+            return self.get(f"/api/courses/?min_rating={options['min_rating']}"), None, False
+        if name == "recommendation_data":
+            return self.get("/api/recommendation_data/", streaming=True), None, False
+
+        def rate():
+            response = self.client.post(
+                f"/api/courses/{self.random_course()}/rate/", {"rating": int(self.rng.integers(1, 6))}
+            )
+            assert response.status_code == 200, response.status_code
+
+        def progress():
+            response = self.client.post(
+                f"/api/courses/{self.random_course()}/progress/", {"completed_topics": ["Intro"]}, format="json"
+            )
+            assert response.status_code == 200, response.status_code
+
+        return {"rate_course": rate, "update_progress": progress}[name], None, True
+
+    def drop_cached_recommendations(self):
+        cache.delete(recommendation_cache_key(self.user.id))
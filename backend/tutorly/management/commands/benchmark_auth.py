@@ -0,0 +1,50 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tutorly.authentication import FastAuthentication, user_cache
+from tutorly.benchmarking import measure
+
+
+class Command(BaseCommand):
+    help = "Compare per-request authentication cost (queries, latency) of the old and new authentication classes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--warmup", type=int, default=20)
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        if user is None:
+            raise CommandError("No users; load some with `manage.py seed_synthetic` first.")
+        header = f"Bearer {RefreshToken.for_user(user).access_token}"
+        factory = APIRequestFactory()
+
+        def authenticate(authenticators):
+            def call():
+                request = Request(factory.get("/api/welcome/", HTTP_AUTHORIZATION=header), authenticators=authenticators)
+                assert request.user.pk == user.pk
+            return call
+
+        user_cache.clear()
+        results = {
+            # The previous DEFAULT_AUTHENTICATION_CLASSES
+            "token_then_jwt": measure(
+                authenticate([TokenAuthentication(), JWTAuthentication()]), options["iterations"], options["warmup"]
+            ),
+            "fast_cached": measure(authenticate([FastAuthentication()]), options["iterations"], options["warmup"]),
+            "fast_uncached": measure(
+                authenticate([FastAuthentication()]), options["iterations"], options["warmup"], before=user_cache.clear
+            ),
+        }
+        baseline = results["token_then_jwt"]
+        for result in results.values():
+            result["queries_saved_per_request"] = baseline["queries_median"] - result["queries_median"]
+            result["speedup_p50"] = round(baseline["p50_ms"] / result["p50_ms"], 2) if result["p50_ms"] else None
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from tutorly.benchmarking import measure, rolled_back
+from tutorly.models import Course
+from tutorly.renderers import FastJSONRenderer, orjson
+from tutorly.serializers import CourseSerializer, course_rows
+
+
+class Command(BaseCommand):
+    help = "Compare CourseSerializer + JSONRenderer with the values_list row plan + orjson on N course rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+
+    def handle(self, *args, **options):
+        # Top up the catalog inside a transaction that is rolled back at the end
+        report = rolled_back(self.top_up_and_run, options)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def top_up_and_run(self, options):
+        missing = options["rows"] - Course.objects.count()
+        if missing > 0:
+            Course.objects.bulk_create(
+                [
+                    Course(title=f"Benchmark course {i}", description="Benchmark " * 20,
+                           syllabus="Intro\nBasics\nWrap-up", price="49.99",
+                           resources='"https://example.com/a\\nhttps://example.com/b"', topic_count=3)
+                    for i in range(missing)
+                ],
+                batch_size=2000,
+            )
+        return self.run(options)
+
+    def run(self, options):
+        courses = Course.objects.order_by("id")[:options["rows"]]
+        rows = course_rows()
+
+        def model_serializer():
+            return JSONRenderer().render(CourseSerializer(courses, many=True).data)
+
+        def row_plan_json():
+            return JSONRenderer().render(rows.many(rows.queryset(courses)))
+
+        def row_plan_fast():
+            return FastJSONRenderer().render(rows.many(rows.queryset(courses)))
+
+        if json.loads(model_serializer()) != json.loads(row_plan_fast()):
+            self.stderr.write(self.style.ERROR("❌ Row plan output differs from CourseSerializer"))
+
+        results = {
+            name: measure(call, options["iterations"], options["warmup"])
+            for name, call in (
+                ("model_serializer", model_serializer),
+                ("row_plan_json", row_plan_json),
+                ("row_plan_fast", row_plan_fast),
+            )
+        }
+        baseline = results["model_serializer"]["p50_ms"]
+        for result in results.values():
+            result["speedup_p50"] = round(baseline / result["p50_ms"], 2) if result["p50_ms"] else None
+        return {"rows": len(courses), "orjson": orjson is not None, "results": results}
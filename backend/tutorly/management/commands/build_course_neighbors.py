@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tutorly.collaborative import ItemItemModel
+from tutorly.neighbors import CourseSimilarity, live_course_ids, neighbor_settings, write_neighbors
+from tutorly.recommender import ContentModel
+
+
+class Command(BaseCommand):
+    help = "Recompute every course's top-k similar courses into CourseNeighbor."
+
+    def add_arguments(self, parser):
+        config = neighbor_settings()
+        parser.add_argument("--k", type=int, default=config["K"], help="Neighbors stored per course.")
+        parser.add_argument("--block-size", type=int, default=config["BLOCK_SIZE"],
+                            help="Courses scored (and written) per block.")
+        parser.add_argument("--text-weight", type=float, default=config["TEXT_WEIGHT"],
+                            help="Weight of TF-IDF similarity; the rest goes to co-rating similarity.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        # ✅ Fresh models from the DB, not whatever this process happened to cache
+        similarity = CourseSimilarity(ContentModel.build(), ItemItemModel.build(), options["text_weight"])
+
+        n_courses = len(similarity.course_ids)
+        block_size = max(1, options["block_size"])
+        live = live_course_ids()  # Once per build, not per block
+        written = 0
+        for start in range(0, n_courses, block_size):
+            rows = range(start, min(start + block_size, n_courses))
+            written += write_neighbors(similarity.neighbors(rows, options["k"]), live)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Stored {written} neighbors for {n_courses} courses in {time.perf_counter() - started:.1f}s"
+        ))
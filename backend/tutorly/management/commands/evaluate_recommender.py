@@ -0,0 +1,132 @@
+import json
+import multiprocessing
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tutorly.evaluation import RECOMMENDERS, OfflineModels, evaluate_users, holdout_split, load_ratings, ratings_by_user
+from tutorly.models import Course
+from tutorly.recommender import ContentModel
+
+# Set in the parent before forking, so workers share the fitted models copy-on-write
+_state = {}
+
+
+def _evaluate_shard(user_ids):
+    return evaluate_users(
+        _state["models"], user_ids, _state["train"], _state["test"], _state["recommenders"], _state["k"]
+    )
+
+
+def _close_inherited_connections():
+    # Workers never touch the DB, but must not reuse the parent's connection either
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Offline Precision/Recall/NDCG@K and coverage of every recommender on held-out ratings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--k", type=int, default=5)
+        parser.add_argument("--holdout", type=int, default=1, help="Ratings held out per user.")
+        parser.add_argument("--strategy", choices=("latest", "random"), default="latest",
+                            help="Hold out each user's most recent (highest id) or random ratings.")
+        parser.add_argument("--relevance-threshold", type=int, default=4,
+                            help="Held-out ratings at or above this count as relevant.")
+        parser.add_argument("--recommenders", nargs="+", choices=RECOMMENDERS, default=list(RECOMMENDERS))
+        parser.add_argument("--max-users", type=int, help="Evaluate a random sample of this many users.")
+        parser.add_argument("--workers", type=int, default=1, help="Processes the users are sharded across.")
+        parser.add_argument("--shard-size", type=int, default=2000)
+        parser.add_argument("--factors", type=int, default=32)
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--regularization", type=float, default=0.05)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rng = np.random.default_rng(options["seed"])
+        k = options["k"]
+
+        ratings = load_ratings()
+        course_ids = np.array(sorted(Course.objects.values_list("id", flat=True)), dtype=np.int64)
+        known = np.isin(ratings["course_id"], course_ids)
+        ratings = {name: values[known] for name, values in ratings.items()}
+        if not len(ratings["id"]):
+            raise CommandError("No rated interactions to evaluate on.")
+
+        keys = ratings["id"] if options["strategy"] == "latest" else rng.random(len(ratings["id"]))
+        test = holdout_split(ratings["user_id"], keys, holdout=options["holdout"])
+        train = ~test
+        relevant = test & (ratings["rating"] >= options["relevance_threshold"])
+
+        test_by_user = ratings_by_user(ratings["user_id"][relevant], ratings["course_id"][relevant],
+                                       ratings["rating"][relevant])
+        users = np.array(sorted(test_by_user), dtype=np.int64)
+        if options["max_users"] and len(users) > options["max_users"]:
+            users = np.sort(rng.choice(users, size=options["max_users"], replace=False))
+        if not len(users):
+            raise CommandError("No user has a relevant held-out rating; lower --relevance-threshold.")
+        self.stderr.write(
+            f"Loaded {len(ratings['id'])} ratings, holding out {int(test.sum())}; "
+            f"evaluating {len(users)} users on {len(course_ids)} courses"
+        )
+
+        models = OfflineModels(
+            course_ids,
+            ratings["user_id"][train], ratings["course_id"][train], ratings["rating"][train],
+            content=ContentModel.build(),
+            recommenders=options["recommenders"],
+            factors=options["factors"],
+            iterations=options["iterations"],
+            regularization=options["regularization"],
+            workers=options["workers"],
+            seed=options["seed"],
+        )
+        self.stderr.write(f"Fitted models in {time.perf_counter() - started:.1f}s")
+
+        _state.update(
+            models=models,
+            train=ratings_by_user(ratings["user_id"][train], ratings["course_id"][train], ratings["rating"][train]),
+            test=test_by_user,
+            recommenders=options["recommenders"],
+            k=k,
+        )
+        shard_size = options["shard_size"]
+        shards = [users[i:i + shard_size].tolist() for i in range(0, len(users), shard_size)]
+
+        totals = None
+        if options["workers"] > 1:
+            _close_inherited_connections()
+            context = multiprocessing.get_context("fork")
+            with context.Pool(options["workers"], initializer=_close_inherited_connections) as pool:
+                for shard_totals in pool.imap_unordered(_evaluate_shard, shards):
+                    totals = self._merge(totals, shard_totals)
+        else:
+            for shard in shards:
+                totals = self._merge(totals, _evaluate_shard(shard))
+        _state.clear()
+
+        report = {
+            "k": k,
+            "strategy": options["strategy"],
+            "holdout": options["holdout"],
+            "seconds": round(time.perf_counter() - started, 1),
+            "recommenders": {name: totals[name].report(k) for name in options["recommenders"]},
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for name, metrics in report["recommenders"].items():
+            self.stdout.write(f"{name:<10} " + "  ".join(f"{key} {value}" for key, value in metrics.items()))
+        self.stdout.write(self.style.SUCCESS(f"✅ Evaluated {len(users)} users in {report['seconds']}s"))
+
+    def _merge(self, totals, shard_totals):
+        if totals is None:
+            return shard_totals
+        for name, metric_totals in shard_totals.items():
+            totals[name].merge(metric_totals)
+        return totals
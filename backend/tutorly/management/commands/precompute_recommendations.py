@@ -0,0 +1,102 @@
+import multiprocessing
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tutorly.caching import MODEL_VERSION_KEY, bump_version, require_shared_cache
+from tutorly.collaborative import get_collaborative_model
+from tutorly.factorization import get_factor_model
+from tutorly.models import RecommendationSnapshot
+from tutorly.recommender import get_content_model
+from tutorly.views import recommend_course_ids
+
+
+def _recommend_shard(user_ids):
+    return [(user_id, recommend_course_ids(User(id=user_id))) for user_id in user_ids]
+
+
+def _close_inherited_connections():
+    # Forked children must open their own DB connections
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Precompute every user's ranked course ids into RecommendationSnapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Processes the users are sharded across.")
+        parser.add_argument("--shard-size", type=int, default=500, help="Users per task handed to a worker.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Snapshots written per bulk upsert.")
+        parser.add_argument("--stale-only", action="store_true",
+                            help="Only refresh users whose snapshot is missing or stale.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        run_started_at = timezone.now()  # Activity after this may be missing from what we compute
+        warning = require_shared_cache()  # The running server has to see the version bump at the end
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        users = User.objects.order_by("id")
+        if options["stale_only"]:
+            fresh = RecommendationSnapshot.objects.filter(stale=False).values("user_id")
+            users = users.exclude(id__in=fresh)
+        user_ids = list(users.values_list("id", flat=True))
+        shard_size = options["shard_size"]
+        shards = [user_ids[i:i + shard_size] for i in range(0, len(user_ids), shard_size)]
+
+        # ✅ Warm the in-process models once so forked workers share them copy-on-write
+        get_content_model()
+        get_collaborative_model()
+        get_factor_model()
+
+        written = 0
+        pending = []
+        if options["workers"] > 1:
+            _close_inherited_connections()
+            context = multiprocessing.get_context("fork")
+            with context.Pool(options["workers"], initializer=_close_inherited_connections) as pool:
+                for results in pool.imap_unordered(_recommend_shard, shards):
+                    pending += results
+                    if len(pending) >= options["batch_size"]:
+                        written += self._write(pending, run_started_at)
+                        pending = []
+        else:
+            for shard in shards:
+                pending += _recommend_shard(shard)
+                if len(pending) >= options["batch_size"]:
+                    written += self._write(pending, run_started_at)
+                    pending = []
+        written += self._write(pending, run_started_at)
+        bump_version(MODEL_VERSION_KEY)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Stored recommendations for {written} users in {time.perf_counter() - started:.1f}s"
+        ))
+
+    def _write(self, results, run_started_at):
+        if not results:
+            return 0
+        now = timezone.now()
+        snapshots = [
+            RecommendationSnapshot(user_id=user_id, course_ids=course_ids, computed_at=now, stale=False)
+            for user_id, course_ids in results
+        ]
+        with transaction.atomic():
+            # Existing rows keep their stale flag here...
+            RecommendationSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=["course_ids", "computed_at"],
+            )
+            # ...and only lose it if the change that set it happened before this run started
+            user_ids = [user_id for user_id, _ in results]
+            for start in range(0, len(user_ids), 500):  # Under SQLite's bound-parameter limit
+                RecommendationSnapshot.objects.filter(user_id__in=user_ids[start:start + 500], stale=True).filter(
+                    Q(stale_since__isnull=True) | Q(stale_since__lt=run_started_at)
+                ).update(stale=False)
+        return len(snapshots)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tutorly.ratings import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized rating count/sum/average/histogram on every Course."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_rating_aggregates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt rating aggregates for {updated} courses"))
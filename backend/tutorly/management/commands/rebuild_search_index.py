@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tutorly.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text course search index (FTS5 on SQLite, tsvector on Postgres)."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ Indexed {indexed} courses"))
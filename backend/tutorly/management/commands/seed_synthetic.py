@@ -0,0 +1,173 @@
+import time
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tutorly.caching import (
+    CATALOG_VERSION_KEY,
+    MODEL_VERSION_KEY,
+    RATINGS_VERSION_KEY,
+    bump_version,
+    require_shared_cache,
+)
+from tutorly.collaborative import invalidate_collaborative_model
+from tutorly.models import Course, Enrollment, Interaction
+from tutorly.ratings import rebuild_rating_aggregates
+from tutorly.recommender import invalidate_content_model
+from tutorly.search import rebuild_search_index
+
+TOPICS = [
+    "python", "django", "react", "javascript", "sql", "statistics", "pandas", "machine learning",
+    "deep learning", "visualization", "typography", "figma", "color theory", "ux research",
+    "algorithms", "data structures", "testing", "docker", "linux", "git", "excel", "probability",
+]
+LEVELS = ["Introduction to", "Practical", "Advanced", "Mastering", "Hands-on", "Foundations of"]
+INSTRUCTORS = ["Ada Park", "Sam Okafor", "Lena Ruiz", "Tom Becker", "Mia Chen", "Ravi Nair"]
+FEEDBACK = ["Great course!", "Very clear explanations.", "Too fast for me.", "Good examples.", "Could be deeper."]
+# J-shaped rating distribution, as seen on most course/review sites
+RATING_PROBABILITIES = [0.06, 0.07, 0.14, 0.31, 0.42]
+
+
+def zipf_weights(n, exponent):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class Command(BaseCommand):
+    help = "Load synthetic users, courses and interactions with power-law popularity, for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--courses", type=int, default=200)
+        parser.add_argument("--interactions", type=int, default=20_000)
+        parser.add_argument("--popularity-exponent", type=float, default=1.1,
+                            help="Zipf exponent of course popularity (and user activity).")
+        parser.add_argument("--feedback-rate", type=float, default=0.2, help="Share of ratings with feedback text.")
+        parser.add_argument("--enrollment-rate", type=float, default=0.3,
+                            help="Share of rated courses the user is also enrolled in.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk_create.")
+        parser.add_argument("--password", default="synthetic", help="Password set on every synthetic user.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        warning = require_shared_cache()  # The running server has to see the version bump at the end
+        if warning:
+            self.stderr.write(self.style.WARNING(warning))
+        rng = np.random.default_rng(options["seed"])
+        self.batch_size = options["batch_size"]
+        n_users, n_courses = options["users"], options["courses"]
+        n_interactions = options["interactions"]
+        if n_interactions and not (n_users and n_courses):
+            raise CommandError("Interactions need at least one user and one course.")
+        if n_interactions > n_users * n_courses:
+            raise CommandError("More interactions than distinct (user, course) pairs.")
+
+        user_ids = self.create_users(n_users, options["password"])
+        course_ids = self.create_courses(n_courses, rng)
+        self.stdout.write(f"Created {len(user_ids)} users and {len(course_ids)} courses")
+
+        pairs = self.sample_pairs(n_interactions, len(user_ids), len(course_ids), options["popularity_exponent"], rng)
+        users, courses = user_ids[pairs // len(course_ids)], course_ids[pairs % len(course_ids)]
+        # Per-course quality shifts the J-shaped distribution up or down a star
+        quality = rng.choice([-1, 0, 0, 1], size=len(course_ids))[pairs % len(course_ids)]
+        ratings = np.clip(rng.choice(np.arange(1, 6), size=len(pairs), p=RATING_PROBABILITIES) + quality, 1, 5)
+        with_feedback = rng.random(len(pairs)) < options["feedback_rate"]
+        enrolled = rng.random(len(pairs)) < options["enrollment_rate"]
+
+        self.bulk_insert(Interaction, (
+            Interaction(
+                user_id=int(user_id), course_id=int(course_id), rating=int(rating),
+                feedback=FEEDBACK[i % len(FEEDBACK)] if with_feedback[i] else "",
+            )
+            for i, (user_id, course_id, rating) in enumerate(zip(users, courses, ratings))
+        ))
+        self.bulk_insert(Enrollment, (
+            Enrollment(user_id=int(user_id), course_id=int(course_id))
+            for user_id, course_id in zip(users[enrolled], courses[enrolled])
+        ))
+        self.stdout.write(f"Created {len(pairs)} interactions and {int(enrolled.sum())} enrollments")
+
+        # ✅ bulk_create skips the signals, so refresh everything they would have maintained
+        with transaction.atomic():
+            rebuild_rating_aggregates(batch_size=self.batch_size)
+        rebuild_search_index()
+        invalidate_content_model()
+        invalidate_collaborative_model()
+        bump_version(CATALOG_VERSION_KEY)
+        bump_version(MODEL_VERSION_KEY)
+        bump_version(RATINGS_VERSION_KEY)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Seeded synthetic data in {time.perf_counter() - started:.1f}s"))
+
+    def bulk_insert(self, model, objects):
+        """bulk_create in batches, one transaction per batch. Returns the created objects."""
+        created, batch = [], []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                created += self._flush(model, batch)
+                batch = []
+        if batch:
+            created += self._flush(model, batch)
+        return created
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            return model.objects.bulk_create(batch, batch_size=self.batch_size)
+
+    def create_users(self, count, password):
+        # Hashing is deliberately slow, so every user shares one hash
+        password_hash = make_password(password)
+        run = f"{time.time_ns() // 1_000_000:x}"
+        users = self.bulk_insert(User, (
+            User(username=f"synthetic_{run}_{i}", email=f"synthetic_{run}_{i}@example.com", password=password_hash)
+            for i in range(count)
+        ))
+        return np.array([user.id for user in users], dtype=np.int64)
+
+    def create_courses(self, count, rng):
+        categories = [choice for choice, _ in Course.CATEGORY_CHOICES]
+        courses = self.bulk_insert(Course, (
+            Course(
+                title=f"{LEVELS[i % len(LEVELS)]} {topic.title()} {i}",
+                description=f"A {LEVELS[i % len(LEVELS)].lower()} course on {topic} and {other}.",
+                syllabus="\n".join(f"{topic.title()} part {part}" for part in range(1, 3 + i % 8)),
+                topic_count=2 + i % 8,  # bulk_create skips Course.save()
+                instructor=INSTRUCTORS[i % len(INSTRUCTORS)],
+                price=f"{rng.integers(0, 200)}.99",
+                duration=f"{3 + i % 10} weeks",
+                category=categories[i % len(categories)],
+            )
+            for i, (topic, other) in enumerate(zip(rng.choice(TOPICS, count), rng.choice(TOPICS, count)))
+        ))
+        return np.array([course.id for course in courses], dtype=np.int64)
+
+    def sample_pairs(self, count, n_users, n_courses, exponent, rng):
+        """Distinct ``user_index * n_courses + course_index`` keys with Zipf-distributed users and courses."""
+        if not count:
+            return np.empty(0, dtype=np.int64)
+        course_weights = zipf_weights(n_courses, exponent)
+        user_weights = zipf_weights(n_users, exponent / 2)  # Activity is flatter than popularity
+        course_order = rng.permutation(n_courses)  # The most popular course isn't always the first one
+        user_order = rng.permutation(n_users)
+
+        pairs = np.empty(0, dtype=np.int64)
+        for _ in range(20):
+            missing = count - len(pairs)
+            if missing <= 0:
+                break
+            draw = int(missing * 1.3) + 16
+            users = user_order[rng.choice(n_users, size=draw, p=user_weights)]
+            courses = course_order[rng.choice(n_courses, size=draw, p=course_weights)]
+            pairs = np.unique(np.concatenate([pairs, users.astype(np.int64) * n_courses + courses]))
+        if len(pairs) < count:
+            if n_users * n_courses > 10_000_000:
+                raise CommandError("Could not sample enough distinct pairs; lower --popularity-exponent.")
+            # Popularity is too skewed to find enough distinct pairs; fill up uniformly
+            rest = np.setdiff1d(np.arange(n_users * n_courses, dtype=np.int64), pairs)
+            pairs = np.concatenate([pairs, rng.choice(rest, size=count - len(pairs), replace=False)])
+        return rng.permutation(rng.choice(pairs, size=count, replace=False))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tutorly.emails import OutboxSender
+
+
+class Command(BaseCommand):
+    help = "Drain the OutboundEmail outbox over a single reused SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument("--backoff", type=int, default=60, help="Base retry delay in seconds, doubled per attempt.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting once the outbox is empty.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        sender = OutboxSender(max_attempts=options["max_attempts"], backoff_seconds=options["backoff"])
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = sender.send_batch(options["batch_size"])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    continue
+                if not options["loop"]:
+                    break
+                # Idle: don't hold the SMTP session open between polls
+                sender.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sender.close()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Sent {total_sent} emails, {total_failed} failed attempts"))
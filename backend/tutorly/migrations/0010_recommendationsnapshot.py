@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0009_alter_course_resources'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_ids', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+                ('stale', models.BooleanField(default=False)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_snapshot', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:56
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    Course = apps.get_model('tutorly', 'Course')
+    Interaction = apps.get_model('tutorly', 'Interaction')
+
+    histogram = {f'rating_{value}_count': Count('id', filter=Q(rating=value)) for value in range(1, 6)}
+    rows = (
+        Interaction.objects.exclude(rating=None)
+        .values('course_id')
+        .annotate(rating_count=Count('id'), rating_sum=Sum('rating'), **histogram)
+        .order_by()
+    )
+    for row in rows:
+        course_id = row.pop('course_id')
+        row['rating_avg'] = row['rating_sum'] / row['rating_count']
+        Course.objects.filter(id=course_id).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0011_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='rating_1_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_2_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_3_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_4_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_5_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_avg',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
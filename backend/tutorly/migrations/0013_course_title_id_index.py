@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0012_course_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['title', 'id'], name='tutorly_cou_title_19ea79_idx'),
+        ),
+    ]
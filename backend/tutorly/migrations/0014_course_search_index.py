@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE tutorly_course_fts USING fts5("
+            "title, description, syllabus, tokenize = 'porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO tutorly_course_fts (rowid, title, description, syllabus) "
+            "SELECT id, title, description, coalesce(syllabus, '') FROM tutorly_course"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE tutorly_course ADD COLUMN search_vector tsvector")
+        schema_editor.execute(
+            "UPDATE tutorly_course SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(syllabus, '')), 'C')"
+        )
+        schema_editor.execute(
+            "CREATE INDEX tutorly_course_search_vector_gin ON tutorly_course USING GIN (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS tutorly_course_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS tutorly_course_search_vector_gin")
+        schema_editor.execute("ALTER TABLE tutorly_course DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0013_course_title_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:05
+
+from django.db import migrations, models
+
+
+def populate_topic_count(apps, schema_editor):
+    Course = apps.get_model('tutorly', 'Course')
+    courses = list(Course.objects.only('id', 'syllabus'))
+    for course in courses:
+        course.topic_count = sum(1 for line in (course.syllabus or '').split('\n') if line.strip())
+    Course.objects.bulk_update(courses, ['topic_count'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0014_course_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='topic_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_topic_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def remove_duplicate_interactions(apps, schema_editor):
+    """Keep the newest (highest id) row per (user, course), then re-derive the touched courses' aggregates."""
+    Course = apps.get_model('tutorly', 'Course')
+    Interaction = apps.get_model('tutorly', 'Interaction')
+
+    duplicates = (
+        Interaction.objects.values('user_id', 'course_id')
+        .annotate(rows=Count('id'), keep=Max('id'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    course_ids = set()
+    for group in duplicates.iterator():
+        Interaction.objects.filter(user_id=group['user_id'], course_id=group['course_id'], id__lt=group['keep']).delete()
+        course_ids.add(group['course_id'])
+
+    histogram = {f'rating_{value}_count': Count('id', filter=Q(rating=value)) for value in range(1, 6)}
+    empty = {'rating_count': 0, 'rating_sum': 0, 'rating_avg': None, **{name: 0 for name in histogram}}
+    for course_id in course_ids:
+        row = Interaction.objects.filter(course_id=course_id).exclude(rating=None).aggregate(
+            rating_count=Count('id'), rating_sum=Sum('rating'), **histogram
+        )
+        if row['rating_count']:
+            row['rating_avg'] = row['rating_sum'] / row['rating_count']
+        Course.objects.filter(id=course_id).update(**(row if row['rating_count'] else empty))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0015_course_topic_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_interactions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interaction',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='interactions', to='tutorly.course'),
+        ),
+        migrations.AlterField(
+            model_name='interaction',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(fields=['user', 'rating', 'course'], name='tutorly_int_user_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(fields=['course', 'rating'], name='tutorly_int_course_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(condition=models.Q(('feedback__gt', '')), fields=['course', '-id'], name='tutorly_int_feedback_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='interaction',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='tutorly_interaction_user_course_uniq'),
+        ),
+    ]
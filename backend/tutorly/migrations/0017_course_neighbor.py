@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0016_interaction_unique_and_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('course', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='tutorly.course')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='tutorly.course')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('course', 'rank'), name='tutorly_neighbor_course_rank_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorly', '0017_course_neighbor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationsnapshot',
+            name='stale_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
+# Maintained only by tutorly.ratings' F-expression updates (and its rebuild)
+RATING_AGGREGATE_FIELDS = ["rating_count", "rating_sum", "rating_avg"] + [f"rating_{value}_count" for value in range(1, 6)]
+
 class Course(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -10,10 +14,14 @@ class Course(models.Model):
     duration = models.CharField(max_length=50, blank=True, null=True)
     resources = models.TextField(blank=True, null=True)
     def get_resources_list(self):
+        return self.parse_resources(self.resources)
+
+    @staticmethod
+    def parse_resources(resources):
         """Convert stored newline-separated resources into a clean list."""
-        if self.resources:
+        if resources:
             # Remove surrounding quotes and split by `\n`
-            cleaned_resources = self.resources.strip().strip('"')
+            cleaned_resources = resources.strip().strip('"')
             return [resource.strip() for resource in cleaned_resources.split("\\n") if resource.strip()]
         return []
 
@@ -28,17 +36,75 @@ class Course(models.Model):
     ]
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='Programming')
 
+    # ✅ Rating aggregates, maintained incrementally by tutorly.ratings (rebuild: `manage.py rebuild_rating_aggregates`)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_avg = models.FloatField(null=True, blank=True, db_index=True)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+
+    # ✅ Number of syllabus topics, kept in sync by save() for progress percentages
+    topic_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["title", "id"])]  # Keyset pagination by title
+
+    @staticmethod
+    def count_topics(syllabus):
+        """Non-blank syllabus lines, the same split the course page uses to list topics."""
+        return sum(1 for line in (syllabus or "").split("\n") if line.strip())
+
+    def save(self, *args, **kwargs):
+        self.topic_count = self.count_topics(self.syllabus)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "syllabus" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "topic_count"}
+        elif update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # A full save of an existing row would write back aggregates loaded before concurrent ratings
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_AGGREGATE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
 
 
 class Interaction(models.Model):
-    user = models.ForeignKey("auth.User", on_delete=models.CASCADE)
-    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='interactions')
+    # The composite indexes below start with user/course, so the single-column FK indexes are dropped
+    user = models.ForeignKey("auth.User", on_delete=models.CASCADE, db_index=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='interactions', db_index=False)
     rating = models.IntegerField(null=True, blank=True)
     feedback = models.TextField(blank=True, null=True)
 
+    class Meta:
+        constraints = [
+            # ✅ One row per user and course; rate_course and upsert_ratings rely on it
+            models.UniqueConstraint(fields=["user", "course"], name="tutorly_interaction_user_course_uniq"),
+        ]
+        indexes = [
+            # A user's ratings (course_id, rating), read straight from the index
+            models.Index(fields=["user", "rating", "course"], name="tutorly_int_user_rating_idx"),
+            # Per-course rating counts/sums/histograms, read straight from the index
+            models.Index(fields=["course", "rating"], name="tutorly_int_course_rating_idx"),
+            # Newest written feedback per course; the only rows course_feedback pages through
+            models.Index(
+                fields=["course", "-id"], name="tutorly_int_feedback_idx", condition=models.Q(feedback__gt=""),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored rating so Course aggregates can be updated by delta on save
+        instance._stored_rating = instance.__dict__.get("rating")
+        return instance
+
     def __str__(self):
         return f"Course: {self.course.title}, User: {self.user.username}"
 
@@ -51,4 +117,78 @@ class Enrollment(models.Model):
         unique_together = ('user', 'course')  # Prevent duplicate enrollments
 
     def __str__(self):
-        return f"{self.user.username} - {self.course.title} (Completed: {len(self.completed_topics)})"
\ No newline at end of file
+        return f"{self.user.username} - {self.course.title} (Completed: {len(self.completed_topics)})"
+
+
+class RecommendationSnapshot(models.Model):
+    """Ranked course ids precomputed for a user by `manage.py precompute_recommendations`."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="recommendation_snapshot")
+    course_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+    stale = models.BooleanField(default=False)  # Set when the user's interactions/enrollments change
+    stale_since = models.DateTimeField(null=True, blank=True)  # Last such change; a batch run started earlier can't clear it
+
+    def __str__(self):
+        return f"{self.user.username} - {len(self.course_ids)} courses ({self.computed_at:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def mark_stale(cls, user_ids):
+        """Flag these users' lists as outdated as of now, in one upsert.
+
+        Users without a snapshot get an empty stale one, so a batch run already computing
+        them can still tell its result predates the change.
+        """
+        now = timezone.now()
+        cls.objects.bulk_create(
+            [cls(user_id=user_id, computed_at=now, stale=True, stale_since=now) for user_id in user_ids],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["stale", "stale_since"],
+        )
+
+
+class CourseNeighbor(models.Model):
+    """One of a course's most similar courses, written by `manage.py build_course_neighbors`."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="neighbors", db_index=False)
+    neighbor = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="neighbor_of")
+    score = models.FloatField()  # Blended text + co-rating cosine similarity
+    rank = models.PositiveSmallIntegerField()  # 1 = most similar
+
+    class Meta:
+        constraints = [
+            # ✅ Also the index course_similar reads a course's list through, already in rank order
+            models.UniqueConstraint(fields=["course", "rank"], name="tutorly_neighbor_course_rank_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} -> {self.neighbor_id} (#{self.rank}, {self.score:.3f})"
+
+
+
+class OutboundEmail(models.Model):
+    """Queued email, delivered by `manage.py send_outbound_emails` instead of inside the request."""
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]  # The worker's polling query
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
@@ -0,0 +1,162 @@
+import logging
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.db import connections, transaction
+
+from .collaborative import get_collaborative_model
+from .models import Course, CourseNeighbor
+from .recommender import get_content_model, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+NEIGHBOR_DEFAULTS = {"K": 10, "TEXT_WEIGHT": 0.5, "BLOCK_SIZE": 256, "REFRESH_ON_SAVE": True, "REFRESH_DELAY": 1.0}
+
+
+def neighbor_settings():
+    return {**NEIGHBOR_DEFAULTS, **getattr(settings, "COURSE_NEIGHBORS", {})}
+
+
+class CourseSimilarity:
+    """Course-course similarity, ``TEXT_WEIGHT`` × TF-IDF cosine + the rest × co-rating cosine.
+
+    Scored one block of rows at a time: two sparse products and a rows × catalog array,
+    never the full catalog × catalog matrix.
+    """
+
+    def __init__(self, content, collaborative, text_weight):
+        self.content = content
+        self.collaborative = collaborative
+        self.text_weight = text_weight
+        self.course_ids = content.course_ids
+        # Collaborative column of each course, in content order (-1: not in that model)
+        self.rating_columns = np.array(
+            [collaborative.course_index.get(int(course_id), -1) for course_id in self.course_ids], dtype=np.int64
+        )
+
+    def scores(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        scores = self.text_weight * self.content.similarity_rows(rows)
+
+        rated_rows = np.flatnonzero(self.rating_columns[rows] >= 0)
+        rated_cols = np.flatnonzero(self.rating_columns >= 0)
+        if self.text_weight < 1 and len(rated_rows) and len(rated_cols):
+            corating = self.collaborative.similarity_rows(self.rating_columns[rows[rated_rows]])
+            scores[np.ix_(rated_rows, rated_cols)] += (
+                (1 - self.text_weight) * corating[:, self.rating_columns[rated_cols]]
+            )
+
+        scores[np.arange(len(rows)), rows] = -np.inf  # A course isn't its own neighbor
+        return scores
+
+    def neighbors(self, rows, k):
+        """``(course id, [(neighbor id, score), ...])`` per row, best first, positive scores only."""
+        results = []
+        for row, scores in zip(rows, self.scores(rows)):
+            best = top_k_indices(scores, k)
+            results.append((
+                int(self.course_ids[row]),
+                [(int(self.course_ids[i]), float(scores[i])) for i in best if scores[i] > 0],
+            ))
+        return results
+
+
+def current_similarity(text_weight=None):
+    """Similarity over the process's live content and collaborative models."""
+    if text_weight is None:
+        text_weight = neighbor_settings()["TEXT_WEIGHT"]
+    return CourseSimilarity(get_content_model(), get_collaborative_model(), text_weight)
+
+
+def live_course_ids():
+    return set(Course.objects.values_list("id", flat=True))
+
+
+def write_neighbors(results, live=None):
+    """Replace the stored lists of the given courses in one transaction. Returns the rows written.
+
+    ``live`` is the set of existing course ids; a caller writing many blocks loads it once.
+    """
+    with transaction.atomic():
+        # Courses deleted since the models were built would fail the foreign keys at commit
+        if live is None:
+            live = live_course_ids()
+        rows = [
+            CourseNeighbor(course_id=course_id, neighbor_id=neighbor_id, score=score, rank=rank)
+            for course_id, neighbors in results
+            if course_id in live
+            for rank, (neighbor_id, score) in enumerate(
+                ((neighbor_id, score) for neighbor_id, score in neighbors if neighbor_id in live), start=1
+            )
+        ]
+        CourseNeighbor.objects.filter(course_id__in=[course_id for course_id, _ in results]).delete()
+        CourseNeighbor.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_course_neighbors(course_ids, k=None):
+    """Recompute the edited courses' lists, and the lists they already appear in.
+
+    Courses they have only now become similar to pick them up at the next full build.
+    """
+    config = neighbor_settings()
+    similarity = current_similarity(config["TEXT_WEIGHT"])
+    course_ids = set(course_ids)
+    listed_by = CourseNeighbor.objects.filter(neighbor_id__in=course_ids).values_list("course_id", flat=True)
+    rows = sorted(similarity.content.index[i] for i in {*course_ids, *listed_by} if i in similarity.content.index)
+    if not rows:
+        return 0
+    results = []
+    for start in range(0, len(rows), config["BLOCK_SIZE"]):
+        results += similarity.neighbors(rows[start:start + config["BLOCK_SIZE"]], k or config["K"])
+    return write_neighbors(results)
+
+
+# ✅ Courses saved since the last refresh, handled by one debounced worker per process
+_pending_refreshes = set()
+_refresh_lock = threading.Lock()
+_refresh_running = threading.Lock()  # Held by the worker, so refreshes never overlap
+_refresh_timer = None
+
+
+def refresh_pending_neighbors():
+    """Refresh every course queued by ``schedule_neighbor_refresh`` in one pass. Returns the rows written."""
+    with _refresh_running:
+        with _refresh_lock:
+            course_ids = set(_pending_refreshes)
+            _pending_refreshes.clear()
+        if not course_ids:
+            return 0
+        return refresh_course_neighbors(course_ids)
+
+
+def _refresh_in_background():
+    try:
+        refresh_pending_neighbors()
+    except Exception:
+        logger.exception("Neighbor refresh failed")
+    finally:
+        connections.close_all()  # This thread's own connections
+
+
+def schedule_neighbor_refresh(course_id):
+    """Queue a course's neighbor refresh for shortly after the current transaction commits.
+
+    Saves in a burst (e.g. a script updating every course) restart the delay, so they
+    share one refresh. The timer isn't a daemon thread: a script exits only once it has run.
+    """
+    config = neighbor_settings()
+    if not config["REFRESH_ON_SAVE"]:
+        return
+
+    def start():
+        global _refresh_timer
+        with _refresh_lock:
+            _pending_refreshes.add(course_id)
+            if _refresh_timer is not None:
+                _refresh_timer.cancel()
+            _refresh_timer = threading.Timer(config["REFRESH_DELAY"], _refresh_in_background)
+            _refresh_timer.start()
+
+    transaction.on_commit(start)
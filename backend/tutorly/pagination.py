@@ -0,0 +1,160 @@
+import base64
+import json
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on a stable ``(sort_key, id)`` ordering.
+
+    Each page is fetched with ``WHERE (sort_key, id) > (last_key, last_id) LIMIT n``
+    on an indexed ordering, so page 1000 costs the same as page 1. Cursors are
+    opaque base64 tokens; clients just follow ``next``/``previous``.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    # Sort keys clients may pick; every one must be non-null and backed by an index ending in id
+    orderings = ("id",)
+    default_ordering = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """``paginate_queryset`` for async views, fetching the page with ``async for``."""
+        return self.finish_page([item async for item in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The ordered, filtered and sliced queryset for the requested page, plus one look-ahead row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if self.ordering.lstrip("-") not in self.orderings:
+            raise ValidationError({self.ordering_query_param: f"Must be one of: {', '.join(self.orderings)}."})
+        self.sort_field = self.ordering.lstrip("-")
+        self.descending = self.ordering.startswith("-")
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor["previous"]
+        # Walking backwards = same query with the comparison and ordering flipped
+        descending = self.descending != self.reverse
+        if self.cursor is not None:
+            queryset = queryset.filter(self.after(self.cursor["key"], self.cursor["id"], descending))
+        prefix = "-" if descending else ""
+        order_by = [prefix + self.sort_field] if self.sort_field == "id" else [prefix + self.sort_field, prefix + "id"]
+        return queryset.order_by(*order_by)[:self.page_size + 1]
+
+    def finish_page(self, page):
+        cursor, reverse = self.cursor, self.reverse
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if page:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(page[-1], previous=False)
+            if cursor is not None and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(page[0], previous=True)
+        return page
+
+    def after(self, key, pk, descending):
+        lookup = "lt" if descending else "gt"
+        if self.sort_field == "id":
+            return Q(**{f"id__{lookup}": pk})
+        return Q(**{f"{self.sort_field}__{lookup}": key}) | Q(**{self.sort_field: key, f"id__{lookup}": pk})
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if payload["o"] != self.ordering:
+                raise ValueError("cursor was issued for another ordering")
+            return {"key": payload["k"], "id": int(payload["i"]), "previous": bool(payload["p"])}
+        except (ValueError, KeyError, TypeError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, item, previous):
+        key = item[self.sort_field] if isinstance(item, dict) else getattr(item, self.sort_field)
+        pk = item["id"] if isinstance(item, dict) else item.id  # Model instance or named values_list row
+        if isinstance(key, Decimal):
+            key = str(key)
+        payload = json.dumps({"o": self.ordering, "k": key, "i": pk, "p": int(previous)}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        return self.next_cursor
+
+    def get_previous_link(self):
+        return self.previous_cursor
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.next_cursor, "previous": self.previous_cursor, "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class CoursePagination(KeysetPagination):
+    page_size = 24
+    orderings = ("id", "title")
+    default_ordering = "id"
+
+
+class FeedbackPagination(KeysetPagination):
+    page_size = 20
+    default_ordering = "-id"  # Newest feedback first
+
+
+class SearchPagination(KeysetPagination):
+    """Keyset paging over ranked search hits, keyed on ``(score, id)``; forward only."""
+
+    page_size = 24
+    default_ordering = "rank"
+
+    def paginate_search(self, search, request):
+        """``search(after, limit)`` returns ``[(id, score), ...]`` best first."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.sort_field = self.default_ordering
+
+        cursor = self.decode_cursor(request)
+        after = (float(cursor["key"]), cursor["id"]) if cursor is not None else None
+        rows = search(after=after, limit=self.page_size + 1)
+        page = rows[:self.page_size]
+
+        self.previous_cursor = None
+        self.next_cursor = None
+        if len(rows) > self.page_size:
+            self.next_cursor = self.encode_cursor({"rank": page[-1][1], "id": page[-1][0]}, previous=False)
+        return page
@@ -0,0 +1,121 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """Records every SQL statement run on a connection while the context is active.
+
+    Uses ``connection.execute_wrapper``, so it works with ``DEBUG = False`` too.
+    """
+
+    def __init__(self, using="default"):
+        self.connection = connections[using]
+        self.queries = []  # (sql, seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    @property
+    def duplicates(self):
+        """SQL text (parameters stripped by the driver) run more than once, with its count."""
+        return {sql: count for sql, count in Counter(sql for sql, _ in self.queries).items() if count > 1}
+
+    def summary(self):
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.total_time * 1000, 2),
+            "duplicates": sum(count - 1 for count in self.duplicates.values()),
+        }
+
+
+class QueryCountMiddleware:
+    """Logs requests that run too many queries, spend too long in the DB, or repeat SQL (N+1)."""
+
+    sync_capable = async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_queries = getattr(settings, "QUERY_COUNT_WARNING_THRESHOLD", 20)
+        self.max_db_time = getattr(settings, "QUERY_TIME_WARNING_MS", 200) / 1000
+        self.max_duplicates = getattr(settings, "QUERY_DUPLICATE_WARNING_THRESHOLD", 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Async ORM calls run on this request's sync thread, so the recorder is attached there
+        recorder = await sync_to_async(lambda: QueryRecorder().__enter__())()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        summary = recorder.summary()
+        if settings.DEBUG:
+            response["X-DB-Query-Count"] = str(summary["queries"])
+            response["X-DB-Time-Ms"] = str(summary["db_time_ms"])
+
+        if (
+            recorder.count > self.max_queries
+            or recorder.total_time > self.max_db_time
+            or summary["duplicates"] > self.max_duplicates
+        ):
+            worst = sorted(recorder.duplicates.items(), key=lambda item: -item[1])[:3]
+            logger.warning(
+                "%s %s ran %d queries in %.1f ms (%d duplicates)%s",
+                request.method,
+                request.path,
+                summary["queries"],
+                summary["db_time_ms"],
+                summary["duplicates"],
+                "".join(f"\n  {count}x {sql[:200]}" for sql, count in worst),
+            )
+        return response
+
+
+class QueryBudgetMixin:
+    """TestCase mixin: ``with self.assertMaxQueries(3): ...`` fails with the offending SQL listed."""
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using="default"):
+        with QueryRecorder(using) as recorder:
+            yield recorder
+        if recorder.count > budget:
+            listing = "\n".join(f"  {i}. {sql}" for i, (sql, _) in enumerate(recorder.queries, start=1))
+            self.fail(f"{recorder.count} queries executed, budget is {budget}:\n{listing}")
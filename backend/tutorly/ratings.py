@@ -0,0 +1,137 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast
+
+from .caching import RATINGS_VERSION_KEY, bump_version, bump_versions, course_version_key, user_version_key
+from .collaborative import record_ratings
+from .models import RATING_AGGREGATE_FIELDS, Course, Interaction, RecommendationSnapshot
+
+RATING_VALUES = range(1, 6)
+
+
+def _as_rating(value):
+    return int(value) if value not in (None, "") else None
+
+
+def aggregate_updates(count_delta, sum_delta, histogram_delta):
+    """F-expression kwargs for ``Course.objects.update()`` applying the given deltas.
+
+    All expressions in one UPDATE read the pre-update row, so the new average is
+    derived from the old sum/count plus the deltas rather than from the new columns.
+    """
+    updates = {}
+    if count_delta:
+        updates["rating_count"] = F("rating_count") + count_delta
+    if sum_delta:
+        updates["rating_sum"] = F("rating_sum") + sum_delta
+    for value, delta in histogram_delta.items():
+        if delta and value in RATING_VALUES:
+            updates[f"rating_{value}_count"] = F(f"rating_{value}_count") + delta
+    if updates:
+        updates["rating_avg"] = Case(
+            When(rating_count__lte=-count_delta, then=Value(None)),
+            default=Cast(F("rating_sum") + sum_delta, FloatField()) / (F("rating_count") + count_delta),
+            output_field=FloatField(),
+        )
+    return updates
+
+
+def apply_rating_change(course_id, old, new):
+    """Move one rating on a course from ``old`` to ``new`` (``None`` means no rating)."""
+    apply_rating_changes([(course_id, old, new)])
+
+
+def apply_rating_changes(changes):
+    """Fold many (course_id, old, new) rating changes into as few UPDATEs as possible.
+
+    Courses whose net deltas are identical share one ``UPDATE ... WHERE id IN (...)``,
+    so a batch costs at most one query per distinct delta, not one per course.
+    """
+    per_course = defaultdict(lambda: [0, 0, defaultdict(int)])
+    for course_id, old, new in changes:
+        old, new = _as_rating(old), _as_rating(new)
+        if old == new:
+            continue
+        totals = per_course[course_id]
+        totals[0] += (new is not None) - (old is not None)
+        totals[1] += (new or 0) - (old or 0)
+        if old is not None:
+            totals[2][old] -= 1
+        if new is not None:
+            totals[2][new] += 1
+
+    groups = defaultdict(list)
+    for course_id, (count_delta, sum_delta, histogram_delta) in per_course.items():
+        histogram_key = tuple(sorted((value, delta) for value, delta in histogram_delta.items() if delta))
+        groups[count_delta, sum_delta, histogram_key].append(course_id)
+
+    for (count_delta, sum_delta, histogram_key), course_ids in groups.items():
+        updates = aggregate_updates(count_delta, sum_delta, dict(histogram_key))
+        if updates:
+            Course.objects.filter(id__in=course_ids).update(**updates)
+
+
+def upsert_ratings(user, ratings):
+    """Create or update one user's ratings in bulk. ``ratings`` maps course_id -> (rating, feedback).
+
+    One transaction with a fixed number of queries: lock the existing rows to read their
+    old ratings, write every row with a single INSERT ... ON CONFLICT (user, course) DO
+    UPDATE, then fold the rating changes into the Course aggregates.
+    bulk_create skips the Interaction signals, so their side effects run here once per batch.
+    Returns ``(created, updated)``.
+    """
+    with transaction.atomic():
+        existing = dict(
+            Interaction.objects.select_for_update()
+            .filter(user=user, course_id__in=list(ratings))
+            .values_list("course_id", "rating")
+        )
+        Interaction.objects.bulk_create(
+            [
+                Interaction(user=user, course_id=course_id, rating=rating, feedback=feedback)
+                for course_id, (rating, feedback) in ratings.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "course"],
+            update_fields=["rating", "feedback"],
+        )
+        changes = [(course_id, existing.get(course_id), rating) for course_id, (rating, _) in ratings.items()]
+
+        apply_rating_changes(changes)
+        RecommendationSnapshot.mark_stale([user.id])
+
+    record_ratings([(user.id, course_id, rating) for course_id, _, rating in changes])
+    bump_version(user_version_key(user.id))
+    bump_versions(RATINGS_VERSION_KEY, *(course_version_key(course_id) for course_id in ratings))
+    return len(ratings) - len(existing), len(existing)
+
+
+def rebuild_rating_aggregates(batch_size=1000):
+    """Recompute every course's aggregates from Interaction. Returns the number of courses written."""
+    histogram = {f"rating_{value}_count": Count("id", filter=Q(rating=value)) for value in RATING_VALUES}
+    stats = {
+        row.pop("course_id"): row
+        for row in Interaction.objects.exclude(rating=None)
+        .values("course_id")
+        .annotate(rating_count=Count("id"), rating_sum=Sum("rating"), **histogram)
+        .order_by()
+    }
+
+    updated = 0
+    batch = []
+    for course in Course.objects.only("id").order_by("id").iterator(chunk_size=batch_size):
+        row = stats.get(course.id, {})
+        for field in RATING_AGGREGATE_FIELDS:
+            setattr(course, field, row.get(field, 0))
+        course.rating_avg = course.rating_sum / course.rating_count if course.rating_count else None
+        batch.append(course)
+        if len(batch) >= batch_size:
+            Course.objects.bulk_update(batch, RATING_AGGREGATE_FIELDS)
+            updated += len(batch)
+            batch = []
+    if batch:
+        Course.objects.bulk_update(batch, RATING_AGGREGATE_FIELDS)
+        updated += len(batch)
+    return updated
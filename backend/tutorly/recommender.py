@@ -0,0 +1,135 @@
+import threading
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .caching import CATALOG_VERSION_KEY, get_versions
+from .models import Course, Interaction
+
+
+def load_rating_arrays(chunk_size=10_000):
+    """Stream every rated Interaction into (user_ids, course_ids, ratings) NumPy arrays."""
+    rows = (
+        Interaction.objects.exclude(rating=None)
+        .order_by("id")
+        .values_list("user_id", "course_id", "rating")
+        .iterator(chunk_size=chunk_size)
+    )
+    flat = np.fromiter((value for row in rows for value in row), dtype=np.int64)
+    flat = flat.reshape(-1, 3)
+    return flat[:, 0], flat[:, 1], flat[:, 2].astype(np.float32)
+
+
+def last_rating_indices(user_ids, course_ids):
+    """Indices of the last row for every (user, course) pair, so re-ratings aren't double counted."""
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    course_ids = np.asarray(course_ids, dtype=np.int64)
+    if not len(user_ids):
+        return np.empty(0, dtype=np.int64)
+    keys = user_ids * (int(course_ids.max()) + 1) + course_ids
+    _, first_from_end = np.unique(keys[::-1], return_index=True)
+    return np.sort(len(keys) - 1 - first_from_end)
+
+
+def top_k_indices(scores, k):
+    """Indices of the k largest scores, best first, without sorting the whole array."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ContentModel:
+    """Fitted TF-IDF view of the course catalog, shared by every request in the process."""
+
+    def __init__(self, course_ids, vectorizer=None, tfidf_matrix=None):
+        self.course_ids = np.asarray(course_ids, dtype=np.int64)
+        self.index = {int(course_id): i for i, course_id in enumerate(self.course_ids)}
+        self.vectorizer = vectorizer
+        self.tfidf_matrix = tfidf_matrix
+
+        if tfidf_matrix is not None and tfidf_matrix.shape[0]:
+            # Column sums of cosine_similarity(tfidf) without building the n×n matrix:
+            # rows are L2-normalised, so sum_i <x_i, x_j> == <sum_i x_i, x_j>.
+            centroid = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+            self.popularity = tfidf_matrix @ centroid
+        else:
+            self.popularity = np.zeros(len(self.course_ids))
+
+        self.ranked_ids = self.course_ids[np.argsort(-self.popularity, kind="stable")]
+        self.version = None  # CATALOG_VERSION_KEY value the catalog was read at
+
+    @classmethod
+    def build(cls):
+        rows = list(Course.objects.order_by("id").values_list("id", "title", "syllabus"))
+        if not rows:
+            return cls([])
+
+        course_ids = [row[0] for row in rows]
+        course_texts = [f"{title} {syllabus or ''}" for _, title, syllabus in rows]
+        vectorizer = TfidfVectorizer(stop_words="english")
+        try:
+            tfidf_matrix = vectorizer.fit_transform(course_texts).tocsr()
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words) – keep catalog order.
+            return cls(course_ids)
+        return cls(course_ids, vectorizer, tfidf_matrix)
+
+    def top_ids(self, k=5, exclude=()):
+        if not exclude:
+            return self.ranked_ids[:k].tolist()
+        exclude = set(exclude)
+        # At most len(exclude) of the first k + len(exclude) can be skipped
+        return [course_id for course_id in self.ranked_ids[:k + len(exclude)].tolist() if course_id not in exclude][:k]
+
+    def similarity_rows(self, rows):
+        """Dense TF-IDF cosine similarities of the courses at ``rows`` against every course."""
+        if self.tfidf_matrix is None:
+            return np.zeros((len(rows), len(self.course_ids)))
+        return (self.tfidf_matrix[rows] @ self.tfidf_matrix.T).toarray()
+
+    def recommend(self, liked_ids, exclude=(), k=5):
+        """Rank courses against a profile built from the TF-IDF rows of ``liked_ids``."""
+        rows = [self.index[course_id] for course_id in liked_ids if course_id in self.index]
+        if not rows or self.tfidf_matrix is None:
+            return self.top_ids(k, exclude)
+
+        # Profile = mean of the liked rows; one sparse matrix–vector product scores the catalog
+        profile = np.asarray(self.tfidf_matrix[rows].mean(axis=0)).ravel()
+        scores = self.tfidf_matrix @ profile
+
+        excluded_rows = [self.index[course_id] for course_id in exclude if course_id in self.index]
+        scores[excluded_rows] = -np.inf
+        best = top_k_indices(scores, k)
+        return [int(self.course_ids[i]) for i in best if np.isfinite(scores[i])]
+
+
+# ✅ Process-level cache, rebuilt lazily after a Course save/delete. Course writes bump
+# CATALOG_VERSION_KEY, so other processes notice and rebuild theirs too.
+_content_model = None
+_content_lock = threading.Lock()
+
+
+def get_content_model():
+    global _content_model
+    (version,) = get_versions(CATALOG_VERSION_KEY)
+    model = _content_model
+    if model is not None and model.version == version:
+        return model
+
+    with _content_lock:
+        (version,) = get_versions(CATALOG_VERSION_KEY)
+        model = _content_model
+        if model is None or model.version != version:
+            # Read the version first: a catalog change during the fit bumps it again
+            model = ContentModel.build()
+            model.version = version
+            _content_model = model
+        return model
+
+
+def invalidate_content_model():
+    """Drop this process's model; the others follow CATALOG_VERSION_KEY."""
+    global _content_model
+    _content_model = None
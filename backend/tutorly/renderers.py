@@ -0,0 +1,23 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; DRF's encoder is used without it
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it's installed.
+
+    orjson is several times faster on large lists. Anything it can't encode natively
+    (Decimal, lazy strings, ...) goes through DRF's JSONEncoder, and indented output
+    (``Accept: application/json; indent=4``) is left to the stock renderer.
+    """
+
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson is not None else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=JSONEncoder().default, option=self.options)
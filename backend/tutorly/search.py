@@ -0,0 +1,129 @@
+import re
+
+from django.db import connection
+
+from .models import Course
+
+# SQLite: FTS5 virtual table keyed by course id. Postgres: weighted tsvector column + GIN index.
+# Both are created by migration 0014 and kept in sync by the Course signals in tutorly.signals.
+FTS_TABLE = "tutorly_course_fts"
+SQLITE_BM25_WEIGHTS = (10.0, 3.0, 1.0)  # title, description, syllabus
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(syllabus, '')), 'C')"
+)
+
+
+def _terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def index_course(course):
+    """Refresh one course's entry in the full-text index."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [course.id])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, syllabus) VALUES (%s, %s, %s, %s)",
+                [course.id, course.title, course.description, course.syllabus or ""],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"UPDATE tutorly_course SET search_vector = {POSTGRES_VECTOR_SQL} WHERE id = %s", [course.id]
+            )
+
+
+def unindex_course(course_id):
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [course_id])
+    # Postgres keeps the vector on the course row itself, so it goes away with the row
+
+
+def _filters(min_rating, category):
+    clauses, params = [], []
+    if min_rating not in (None, ""):
+        clauses.append("c.rating_avg >= %s")
+        params.append(float(min_rating))
+    if category:
+        clauses.append("c.category = %s")
+        params.append(category)
+    return clauses, params
+
+
+def search_courses(query, min_rating=None, category=None, after=None, limit=24):
+    """Ranked ``[(course_id, score), ...]`` matches, best first (lower score = better).
+
+    ``after`` is the ``(score, id)`` of the last row already returned, for keyset paging.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    clauses, params = _filters(min_rating, category)
+
+    if connection.vendor == "sqlite":
+        # Quote every term (no FTS syntax injection) and prefix-match it
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        inner = (
+            f"SELECT c.id AS id, bm25({FTS_TABLE}, {weights}) AS score "
+            f"FROM {FTS_TABLE} JOIN tutorly_course c ON c.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s"
+        )
+        params = [match] + params
+    elif connection.vendor == "postgresql":
+        match = " & ".join(f"{term}:*" for term in terms)
+        # ts_rank_cd is float4; as float8 the score equals the Python float the cursor carries back,
+        # so rows tied with a page's last row aren't skipped
+        inner = (
+            "SELECT c.id AS id, -ts_rank_cd(c.search_vector, to_tsquery('english', %s))::float8 AS score "
+            "FROM tutorly_course c WHERE c.search_vector @@ to_tsquery('english', %s)"
+        )
+        params = [match, match] + params
+    else:
+        return _search_fallback(terms, min_rating, category, after, limit)
+
+    sql = inner + "".join(f" AND {clause}" for clause in clauses)
+    sql = f"SELECT id, score FROM ({sql}) ranked"
+    if after is not None:
+        sql += " WHERE score > %s OR (score = %s AND id > %s)"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY score, id LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def _search_fallback(terms, min_rating, category, after, limit):
+    """Unranked substring search for databases without a full-text index."""
+    courses = Course.objects.all()
+    for term in terms:
+        courses = (
+            courses.filter(title__icontains=term)
+            | courses.filter(description__icontains=term)
+            | courses.filter(syllabus__icontains=term)
+        )
+    if min_rating not in (None, ""):
+        courses = courses.filter(rating_avg__gte=min_rating)
+    if category:
+        courses = courses.filter(category=category)
+    if after is not None:
+        courses = courses.filter(id__gt=after[1])
+    return [(course_id, 0.0) for course_id in courses.order_by("id").values_list("id", flat=True)[:limit]]
+
+
+def rebuild_search_index():
+    """Recreate every index entry from the course table. Returns the number of courses indexed."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, syllabus) "
+                "SELECT id, title, description, coalesce(syllabus, '') FROM tutorly_course"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"UPDATE tutorly_course SET search_vector = {POSTGRES_VECTOR_SQL}")
+    return Course.objects.count()
@@ -1,6 +1,11 @@
+import functools
+import operator
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth.models import User
 from .models import Course, Interaction
+from .ratings import RATING_AGGREGATE_FIELDS
 
 # ✅ User Serializer (Allows Profile Update)
 class UserSerializer(serializers.ModelSerializer):
@@ -34,17 +39,88 @@ class UserSerializer(serializers.ModelSerializer):
 # ✅ Course Serializer
 class CourseSerializer(serializers.ModelSerializer):
 
-    avg_rating = serializers.FloatField(read_only=True)  # ✅ Include average rating
+    avg_rating = serializers.FloatField(source="rating_avg", read_only=True)  # ✅ Stored average rating
     resources = serializers.SerializerMethodField()  # Custom method to handle conversion
 
     class Meta:
         model = Course
-        fields = '__all__'
+        exclude = ['rating_sum', 'rating_avg']
+        read_only_fields = RATING_AGGREGATE_FIELDS + ["topic_count"]
     
     def get_resources(self, obj):
         
         return obj.get_resources_list()
 
+# ✅ Read-only fast path for lists: CourseSerializer's output built straight from values_list() rows
+class CourseRowSerializer:
+    """Compiles a serializer's fields once into output names, row positions and converters.
+
+    Fetch ``queryset(...)`` rows and pass them to ``many()``; the dicts match what
+    CourseSerializer produces, without DRF's per-field, per-row machinery.
+    """
+
+    # SerializerMethodFields: output name -> (column, function of that column)
+    method_fields = {"resources": ("resources", Course.parse_resources)}
+    # The DB driver already returns the JSON-ready type for these
+    native_fields = (
+        serializers.IntegerField,
+        serializers.FloatField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.BooleanField,
+    )
+
+    def __init__(self, serializer_class=CourseSerializer):
+        self.columns, self.names, indexes, self.converted = [], [], [], []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                column, convert = self.method_fields[name]
+                always = True  # Called even for NULL, like get_<name>()
+            else:
+                column, convert, always = field.source, self._converter(field), False
+            if column not in self.columns:
+                self.columns.append(column)
+            self.names.append(name)
+            indexes.append(self.columns.index(column))
+            if convert is not None:
+                self.converted.append((name, convert, always))
+        # One C-level call pulls every output value out of a row, in output order
+        self.values = operator.itemgetter(*indexes) if len(indexes) > 1 else lambda row: (row[indexes[0]],)
+
+    def _converter(self, field):
+        if isinstance(field, serializers.DecimalField):
+            coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            if coerce_to_string and field.decimal_places is not None and not (field.localize or field.normalize_output):
+                places = field.decimal_places
+                return lambda value: f"{value:.{places}f}"  # Stored values already have that many places
+            return field.to_representation
+        if isinstance(field, self.native_fields):
+            return None
+        return field.to_representation
+
+    def queryset(self, queryset):
+        # Named rows, so keyset pagination can still read the sort key off each row
+        return queryset.values_list(*self.columns, named=True)
+
+    def to_representation(self, row):
+        data = dict(zip(self.names, self.values(row)))
+        for name, convert, always in self.converted:
+            value = data[name]
+            if always or value is not None:
+                data[name] = convert(value)
+        return data
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+@functools.cache
+def course_rows():
+    """Shared CourseRowSerializer, compiled on first use (after the app registry is ready)."""
+    return CourseRowSerializer()
+
 # ✅ Interaction Serializer (Ensures rating can be written)
 class InteractionSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField()  # Show username instead of ID
@@ -57,3 +133,10 @@ class InteractionSerializer(serializers.ModelSerializer):
             'rating': {'required': True},  # ✅ Ensure rating is required
             'feedback': {'required': False},  # ✅ Allow empty feedback
         }
+
+
+# ✅ One entry of a bulk rating upload
+class RatingInputSerializer(serializers.Serializer):
+    course_id = serializers.IntegerField()
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    feedback = serializers.CharField(required=False, allow_blank=True, default="")
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .caching import (
+    CATALOG_VERSION_KEY,
+    RATINGS_VERSION_KEY,
+    bump_version,
+    bump_versions,
+    course_version_key,
+    user_version_key,
+)
+from .catalog import schedule_catalog_rebuild
+from .collaborative import record_rating
+from .models import Course, Enrollment, Interaction, RecommendationSnapshot
+from .neighbors import schedule_neighbor_refresh
+from .ratings import apply_rating_change
+from .recommender import invalidate_content_model
+from .search import index_course, unindex_course
+
+
+@receiver([post_save, post_delete], sender=Course)
+def course_changed(sender, instance, **kwargs):
+    invalidate_content_model()
+    bump_version(CATALOG_VERSION_KEY)
+    bump_version(course_version_key(instance.id))
+    schedule_catalog_rebuild()
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, **kwargs):
+    index_course(instance)
+    schedule_neighbor_refresh(instance.id)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    unindex_course(instance.id)
+
+
+@receiver(post_save, sender=Interaction)
+def interaction_saved(sender, instance, **kwargs):
+    apply_rating_change(instance.course_id, getattr(instance, "_stored_rating", None), instance.rating)
+    instance._stored_rating = instance.rating
+    record_rating(instance.user_id, instance.course_id, instance.rating)
+
+
+@receiver(post_delete, sender=Interaction)
+def interaction_deleted(sender, instance, **kwargs):
+    apply_rating_change(instance.course_id, getattr(instance, "_stored_rating", instance.rating), None)
+    record_rating(instance.user_id, instance.course_id, None)
+
+
+@receiver([post_save, post_delete], sender=Interaction)
+def course_ratings_changed(sender, instance, **kwargs):
+    # Course aggregates (catalog, detail) and the feedback list are rendered from these rows
+    bump_versions(RATINGS_VERSION_KEY, course_version_key(instance.course_id))
+    schedule_catalog_rebuild()
+
+
+@receiver([post_save, post_delete], sender=Interaction)
+@receiver([post_save, post_delete], sender=Enrollment)
+def user_activity_changed(sender, instance, update_fields=None, origin=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"completed_topics"}:
+        return  # Ticking off topics doesn't change which courses the user has
+    if isinstance(origin, User):
+        return  # Cascading from deleting the user, whose snapshot goes too
+    # The precomputed list no longer reflects this user; serve live until the next batch run
+    RecommendationSnapshot.mark_stale([instance.user_id])
+    bump_version(user_version_key(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Profile updates, password changes, deactivation: authentication re-reads the row
+    user_cache.invalidate_on_commit(instance.pk)
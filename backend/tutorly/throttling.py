@@ -0,0 +1,205 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from .caching import increment_counter, read_counters
+
+THROTTLED_KEY = "tutorly:stats:throttled"
+SHED_KEY = "tutorly:stats:shed"
+
+TOKEN_BUCKET_DEFAULTS = {"ENABLED": True, "CAPACITY": 60, "RATE": 1.0, "COSTS": {}, "CACHE": None}
+LOAD_SHEDDING_DEFAULTS = {"MAX_IN_FLIGHT": 8, "LATENCY_MS": 2000, "LATENCY_WINDOW": 10}
+
+
+def bucket_settings():
+    return {**TOKEN_BUCKET_DEFAULTS, **getattr(settings, "TOKEN_BUCKET", {})}
+
+
+class LocalBuckets:
+    """Token buckets in this process's memory."""
+
+    max_buckets = 10_000  # Full buckets are forgotten past this many; they'd start full anyway
+
+    def __init__(self):
+        self.buckets = {}  # key -> (tokens, last refill time)
+        self.lock = threading.Lock()
+
+    def take(self, key, cost, capacity, rate, now):
+        """Spend ``cost`` tokens; returns 0 on success, else the seconds until they'd be available."""
+        with self.lock:
+            tokens, stamp = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            self.buckets[key] = (tokens - cost if not wait else tokens, now)
+            if len(self.buckets) > self.max_buckets:
+                self.prune(capacity, rate, now)
+            return wait
+
+    def prune(self, capacity, rate, now):
+        self.buckets = {
+            key: (tokens, stamp) for key, (tokens, stamp) in self.buckets.items()
+            if tokens + (now - stamp) * rate < capacity
+        }
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBuckets:
+    """Token buckets in a shared cache, so every worker draws from the same budget.
+
+    Read-modify-write without a lock: two workers racing on one user's bucket can
+    both spend the same tokens, which only ever makes the limit slightly looser.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def take(self, key, cost, capacity, rate, now):
+        tokens, stamp = self.cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - stamp) * rate)
+        wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+        # An untouched bucket is full again after capacity / rate seconds; let it expire then
+        self.cache.set(key, (tokens - cost if not wait else tokens, now), timeout=math.ceil(capacity / rate) + 1)
+        return wait
+
+    def clear(self):
+        pass  # Entries expire once refilled
+
+
+_local_buckets = LocalBuckets()
+
+
+def get_buckets():
+    alias = bucket_settings()["CACHE"]
+    return CacheBuckets(alias) if alias else _local_buckets
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Per-user token bucket where each endpoint costs ``TOKEN_BUCKET["COSTS"][url name]`` (default 1).
+
+    Cheap endpoints barely dent the bucket; recommend_courses and the exports drain it fast.
+    Anonymous clients are bucketed by IP.
+    """
+
+    def allow_request(self, request, view):
+        config = bucket_settings()
+        if not config["ENABLED"]:
+            return True
+        match = getattr(request, "resolver_match", None)
+        cost = min(config["COSTS"].get(match.url_name if match else None, 1), config["CAPACITY"])
+        if cost <= 0:
+            return True
+
+        user = getattr(request, "user", None)
+        ident = f"user:{user.pk}" if user is not None and user.is_authenticated else f"ip:{self.get_ident(request)}"
+        self.retry_after = get_buckets().take(
+            f"tutorly:throttle:{ident}", cost, config["CAPACITY"], config["RATE"], time.time()
+        )
+        if self.retry_after:
+            increment_counter(THROTTLED_KEY)
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoadShedder:
+    """In-flight counts and recent latency of expensive endpoints, in this process.
+
+    An endpoint is overloaded while ``MAX_IN_FLIGHT`` calls are already running, or while its
+    latency average (updated within the last ``LATENCY_WINDOW`` seconds) exceeds ``LATENCY_MS``.
+    The window makes the latency signal expire, so a shedding endpoint gets probed again.
+    """
+
+    def __init__(self):
+        self.in_flight = defaultdict(int)
+        self.latency = {}  # name -> (moving average in seconds, updated at)
+        self.lock = threading.Lock()
+
+    def settings(self):
+        return {**LOAD_SHEDDING_DEFAULTS, **getattr(settings, "LOAD_SHEDDING", {})}
+
+    def overloaded(self, name):
+        config = self.settings()
+        with self.lock:
+            if self.in_flight[name] >= config["MAX_IN_FLIGHT"]:
+                return True
+            average, updated = self.latency.get(name, (0.0, 0.0))
+        return time.monotonic() - updated < config["LATENCY_WINDOW"] and average * 1000 > config["LATENCY_MS"]
+
+    def begin(self, name):
+        with self.lock:
+            self.in_flight[name] += 1
+        return time.monotonic()
+
+    def end(self, name, started):
+        now = time.monotonic()
+        with self.lock:
+            self.in_flight[name] -= 1
+            average, _ = self.latency.get(name, (now - started, now))
+            self.latency[name] = (0.8 * average + 0.2 * (now - started), now)
+
+    @contextmanager
+    def track(self, name):
+        started = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name, started)
+
+    def track_response(self, name, started, response):
+        """Ends the call when the response is closed, i.e. after a streamed body is sent or abandoned."""
+        if not response.streaming:
+            self.end(name, started)
+            return response
+        response.streaming_content = _ClosingStream(response.streaming_content, lambda: self.end(name, started))
+        return response
+
+    def reset(self):
+        with self.lock:
+            self.in_flight.clear()
+            self.latency.clear()
+
+
+class _ClosingStream:
+    # Django calls close() on streaming content once the response is finished
+    def __init__(self, chunks, on_close):
+        self.chunks, self.on_close = chunks, on_close
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        if self.on_close is not None:
+            self.on_close()
+            self.on_close = None
+
+
+load_shedder = LoadShedder()
+
+
+def reset_throttling():
+    """Forget every in-process bucket and load reading (tests, or after changing the limits)."""
+    _local_buckets.clear()
+    load_shedder.reset()
+
+
+def record_shed():
+    increment_counter(SHED_KEY)
+
+
+def throttle_stats():
+    throttled, shed = read_counters(THROTTLED_KEY, SHED_KEY)
+    with load_shedder.lock:
+        in_flight = {name: count for name, count in load_shedder.in_flight.items() if count}
+        latency = {name: round(average * 1000, 1) for name, (average, _) in load_shedder.latency.items()}
+    return {"throttled": throttled, "shed": shed, "in_flight": in_flight, "latency_ms": latency}
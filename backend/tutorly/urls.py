@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views  # Import views from the current app
+from . import async_views, views  # Import views from the current app
 from .views import user_profile, enroll_course,change_password,update_progress
 
 # ✅ Initialize the DRF Router
@@ -20,6 +20,8 @@ urlpatterns = [
     path('courses/<int:id>/', views.course_detail, name='course_detail'),  # Course details
     path('courses/<int:id>/rate/', views.rate_course, name='rate_course'),  # Rate a course
     path('courses/<int:id>/feedback/', views.course_feedback, name='course_feedback'),  # View course feedback
+    path('courses/<int:id>/similar/', views.course_similar, name='course_similar'),  # Precomputed similar courses
+    path('ratings/bulk/', views.bulk_rate_courses, name='bulk_rate_courses'),  # Rate many courses at once
     
     # ✅ FIXED: Updated enrollment URL to match frontend
     path('courses/<int:id>/enroll/', enroll_course, name='enroll-course'),
@@ -29,7 +31,16 @@ urlpatterns = [
     path('login/', views.login_user, name='login_user'),  # User login
     path('recommendation_data/', views.recommendation_data, name='recommendation_data'),
     path('recommend_courses/', views.recommend_courses, name='recommend_courses'),
+    path('metrics/', views.metrics, name='metrics'),  # Cache hit rates (admin only)
     path("user/profile/", user_profile, name="user-profile"),
     path("user/change-password/", change_password, name="change-password"),
     path("courses/<int:course_id>/progress/", update_progress, name="update-progress"),
+    path("user/progress/", views.progress_summary, name="progress-summary"),  # Progress across enrollments
+
+    # ✅ Async (ASGI) versions of the read-heavy endpoints; same responses, no thread held while waiting
+    path("async/recommend_courses/", async_views.recommend_courses, name="async-recommend-courses"),
+    path("async/courses/", async_views.course_list, name="async-course-list"),
+    path("async/courses/<int:id>/", async_views.course_detail, name="async-course-detail"),
+    path("async/courses/<int:id>/feedback/", async_views.course_feedback, name="async-course-feedback"),
+    path("async/user/profile/", async_views.user_profile, name="async-user-profile"),
 ]
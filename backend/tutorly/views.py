@@ -2,103 +2,161 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from django.contrib.auth.models import User
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework import generics, permissions
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg, Count
-from .models import Course, Interaction, Enrollment
-from .serializers import UserSerializer, CourseSerializer, InteractionSerializer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from django.core.mail import send_mail
-from django.conf import settings
-
-# ✅ Content-Based Recommendation
-def content_based_recommendation(courses):
-    if not courses:
-        return Response({"recommended_courses": []})
-
-    course_texts = [f"{course.title} {course.syllabus}" for course in courses]
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = vectorizer.fit_transform(course_texts)
-    similarity_matrix = cosine_similarity(tfidf_matrix)
-
-    ranked_indices = np.argsort(similarity_matrix.sum(axis=0))[::-1]
-    courses_list = list(courses)
-    recommended_courses = [courses_list[int(i)] for i in ranked_indices[:5]]
-
-    serializer = CourseSerializer(recommended_courses, many=True)
-    return Response({"recommended_courses": serializer.data})
-
-# ✅ User-Based Collaborative Filtering
-def user_based_recommendation(user):
-    user_interactions = Interaction.objects.filter(user=user).exclude(rating=None)
-
-    if not user_interactions.exists():
-        return []
-
-    similar_users = Interaction.objects.filter(
-        course__in=user_interactions.values_list('course', flat=True)
-    ).exclude(user=user).values_list('user', flat=True)
-
-    recommended_courses = Interaction.objects.filter(
-        user__in=similar_users
-    ).values("course").annotate(avg_rating=Avg("rating")).order_by("-avg_rating")[:5]
-
-    return [Course.objects.get(id=entry["course"]) for entry in recommended_courses]
-
-# ✅ Hybrid Recommendation System
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def recommend_courses(request):
-    user = request.user
-    all_courses = Course.objects.all()
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .models import Course, Interaction, Enrollment, RecommendationSnapshot
+from .serializers import UserSerializer, CourseSerializer, InteractionSerializer, RatingInputSerializer, course_rows
+from .caching import (
+    CATALOG_VERSION_KEY,
+    POPULAR_RECOMMENDATIONS_KEY,
+    RATINGS_VERSION_KEY,
+    course_version_key,
+    get_cached_recommendations,
+    last_recommendations_key,
+    recommendation_cache_key,
+    recommendation_cache_stats,
+    set_cached_recommendations,
+    versioned_etag,
+)
+from .catalog import catalog_response, schedule_catalog_rebuild
+from .collaborative import get_collaborative_model
+from .emails import queue_email
+from .exports import EXPORTERS
+from .factorization import get_factor_model
+from .pagination import CoursePagination, FeedbackPagination, KeysetPagination, SearchPagination
+from .ratings import upsert_ratings
+from .recommender import get_content_model
+from .search import search_courses
+from .throttling import load_shedder, record_shed, throttle_stats
+
+# ✅ Content-Based Recommendation (served from the cached TF-IDF model)
+def content_based_course_ids(user=None, limit=5, ratings=None):
+    model = get_content_model()
+    if user is None:
+        return model.top_ids(limit)
+
+    # ✅ Personalize from courses the user rated highly or enrolled in
+    if ratings is None:
+        ratings = list(Interaction.objects.filter(user=user).values_list("course_id", "rating"))
+    enrolled = list(Enrollment.objects.filter(user=user).values_list("course_id", flat=True))
+    return rank_content(model, ratings, enrolled, limit)
+
+def rank_content(model, ratings, enrolled, limit=5):
+    # Pure scoring, no queries: safe to run on a worker thread
+    liked = [course_id for course_id, rating in ratings if rating is not None and rating >= 4] + enrolled
+    if not liked:
+        return model.top_ids(limit)
+
+    seen = {course_id for course_id, _ in ratings} | set(enrolled)
+    return model.recommend(liked, exclude=seen, k=limit)
+
+# ✅ Collaborative Filtering: trained factor model (published only once it beats item-item offline) if it knows the user, else the live item-item model
+def collaborative_model(user):
+    factor_model = get_factor_model()
+    if factor_model is not None and factor_model.knows_user(user.id):
+        return factor_model
+    return get_collaborative_model()
+
+def user_based_course_ids(user, limit=5, exclude=()):
+    return collaborative_model(user).recommend(user.id, k=limit, exclude=exclude)
+
+def bad_rated_course_ids(user_ratings):
+    return {course_id for course_id, rating in user_ratings if rating is not None and rating <= 2}
+
+def rank_rated(model, user_id, user_ratings, limit=5):
+    """Highly rated courses first, then collaborative picks; pure scoring, no queries."""
+    bad_rated_courses = bad_rated_course_ids(user_ratings)
 
-    # ✅ Check user interactions
-    user_ratings = Interaction.objects.filter(user=user).values("course", "rating")
-    
-    if not user_ratings.exists():
-        print(f"🔹 New user detected: {user.username}. Using content-based recommendations.")
-        return content_based_recommendation(all_courses)  # ✅ Fallback for new users
-
-    # ✅ Remove poorly rated courses
-    bad_rated_courses = [entry["course"] for entry in user_ratings if entry["rating"] <= 2]
-    available_courses = Course.objects.exclude(id__in=bad_rated_courses)
+    # ✅ Prioritize high-rated courses
+    prioritized_courses = sorted(course_id for course_id, rating in user_ratings if rating is not None and rating >= 4)
 
-    if not available_courses:
-        return Response({"recommended_courses": []})  # No good courses left
+    # ✅ Collaborative filtering, never suggesting bad-rated ones
+    rated_courses = [course_id for course_id, _ in user_ratings]
+    collaborative_courses = [
+        course_id for course_id in model.recommend(user_id, k=limit, exclude=rated_courses)
+        if course_id not in bad_rated_courses
+    ]
 
-    # ✅ Prioritize high-rated courses
-    high_rated_courses = [entry["course"] for entry in user_ratings if entry["rating"] >= 4]
-    prioritized_courses = [course for course in available_courses if course.id in high_rated_courses]
+    # ✅ Remove duplicates & maintain order
+    return list(dict.fromkeys(prioritized_courses + collaborative_courses))
 
-    # ✅ Use collaborative filtering (only if user has interactions)
-    collaborative_courses = user_based_recommendation(user) if user_ratings else []
+# ✅ Hybrid Recommendation System (returns ranked course ids)
+def recommend_course_ids(user):
+    user_ratings = list(Interaction.objects.filter(user=user).values_list("course_id", "rating"))
 
-    # ✅ Ensure collaborative courses don’t include bad-rated ones
-    collaborative_courses = [course for course in collaborative_courses if course.id not in bad_rated_courses]
+    # ✅ Fallback for new users
+    if not user_ratings:
+        return content_based_course_ids(user, ratings=user_ratings)
 
-    # ✅ Final recommendations
-    recommended_courses = prioritized_courses + collaborative_courses
+    # ✅ Remove poorly rated courses
+    if not Course.objects.exclude(id__in=bad_rated_course_ids(user_ratings)).exists():
+        return []  # No good courses left
 
-    # ✅ Remove duplicates & maintain order
-    seen = set()
-    final_recommendations = []
-    for course in recommended_courses:
-        if course.id not in seen:
-            final_recommendations.append(course)
-            seen.add(course.id)
+    final_recommendations = rank_rated(collaborative_model(user), user.id, user_ratings)
 
     # ✅ If no user-based recommendations, use content-based
     if not final_recommendations:
-        print("🔹 No user-based recommendations found. Using content-based fallback.")
-        return content_based_recommendation(all_courses)
+        return content_based_course_ids(user, ratings=user_ratings)
+    return final_recommendations
 
-    serializer = CourseSerializer(final_recommendations, many=True)
-    return Response({"recommended_courses": serializer.data})
+def serialize_course_ids(course_ids):
+    # ✅ values_list fast path; same output as CourseSerializer
+    rows = course_rows()
+    courses = {row.id: row for row in rows.queryset(Course.objects.filter(id__in=course_ids))}
+    return rows.many(courses[course_id] for course_id in course_ids if course_id in courses)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def recommend_courses(request):
+    user = request.user
+
+    # ✅ Cached response, versioned on this user's activity and on catalog/model changes
+    cache_key = recommendation_cache_key(user.id)
+    payload = get_cached_recommendations(cache_key)
+    if payload is not None:
+        return Response(payload)
+
+    # ✅ Serve the precomputed list unless the user changed since the last batch run
+    course_ids = (
+        RecommendationSnapshot.objects.filter(user=user, stale=False)
+        .values_list("course_ids", flat=True)
+        .first()
+    )
+    if course_ids is None:
+        # ✅ Load shedding: while recommendations are backed up, serve a fallback instead of computing
+        if load_shedder.overloaded("recommend_courses"):
+            return Response(shed_recommendations(user), headers={"X-Load-Shed": "1"})
+        with load_shedder.track("recommend_courses"):
+            course_ids = recommend_course_ids(user)
+
+    payload = {"recommended_courses": serialize_course_ids(course_ids)}
+    set_cached_recommendations(cache_key, payload, user.id)
+    return Response(payload)
+
+def popular_course_ids(limit=5):
+    return list(Course.objects.order_by("-rating_count", "id").values_list("id", flat=True)[:limit])
+
+def shed_recommendations(user):
+    """The user's last computed list, else the most rated courses; never a fresh computation."""
+    record_shed()
+    payload = cache.get(last_recommendations_key(user.id))
+    if payload is None:
+        payload = cache.get_or_set(
+            POPULAR_RECOMMENDATIONS_KEY, lambda: {"recommended_courses": serialize_course_ids(popular_course_ids())}, 60
+        )
+    return payload
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return Response({"recommendation_cache": recommendation_cache_stats(), "throttling": throttle_stats()})
 
 
 
@@ -107,13 +165,34 @@ def recommend_courses(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def recommendation_data(request):
-    courses = Course.objects.all()
-    interactions = Interaction.objects.all()
+    # ✅ Streaming NDJSON by default; ?export=npz|parquet returns columnar rating arrays
+    export = request.GET.get("export", "ndjson")
+    exporter = EXPORTERS.get(export)
+    if exporter is None:
+        return Response({"error": f"Unknown export format. Use one of: {', '.join(EXPORTERS)}."}, status=400)
+
+    # ✅ Exports can't be served stale, so under load they are refused with a retry hint
+    if load_shedder.overloaded("recommendation_data"):
+        record_shed()
+        return Response({"error": "Export temporarily unavailable, retry shortly."}, status=503,
+                        headers={"Retry-After": "30"})
+
+    started = load_shedder.begin("recommendation_data")
+    try:
+        response = exporter()
+    except ImportError:
+        response = Response({"error": f"The {export} export needs pyarrow or fastparquet installed."}, status=501)
+    except Exception:
+        load_shedder.end("recommendation_data", started)
+        raise
+    return load_shedder.track_response("recommendation_data", started, response)
 
-    course_data = CourseSerializer(courses, many=True).data
-    interaction_data = InteractionSerializer(interactions, many=True).data
+# ✅ Conditional GET: ETags come from cached versions, so a 304 costs no ORM or serializer work
+def catalog_etag(request, *args, **kwargs):
+    return versioned_etag(request, CATALOG_VERSION_KEY, RATINGS_VERSION_KEY)
 
-    return Response({"courses": course_data, "interactions": interaction_data})
+def course_etag(request, id=None, pk=None):
+    return versioned_etag(request, course_version_key(id if id is not None else pk))
 
 # ✅ Authentication & User Management
 class RegisterUserView(generics.CreateAPIView):
@@ -125,13 +204,11 @@ class RegisterUserView(generics.CreateAPIView):
         response = super().create(request, *args, **kwargs)
         user = User.objects.get(username=request.data['username'])
 
-        # ✅ Send Welcome Email
-        send_mail(
+        # ✅ Queue Welcome Email
+        queue_email(
             "Welcome to Tutorly!",
             f"Hello {user.username},\n\nThank you for registering at Tutorly! Start exploring courses today.\n\nBest,\nTutorly Team",
-            settings.EMAIL_HOST_USER,
             [user.email],
-            fail_silently=False,
         )
 
         refresh = RefreshToken.for_user(user)
@@ -144,37 +221,47 @@ class UserViewSet(ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
-from django.db.models import Avg  # ✅ Ensure this is imported
-
 class CourseViewSet(ModelViewSet):
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CoursePagination
 
     def get_queryset(self):
-        return Course.objects.annotate(avg_rating=Avg("interactions__rating"))
+        return Course.objects.all()
+
+    @method_decorator(condition(etag_func=course_etag))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
+    @method_decorator(condition(etag_func=catalog_etag))
     def list(self, request):
         search_query = request.GET.get("search", "")
         min_rating = request.GET.get("min_rating", "")
+        category = request.GET.get("category", "")
 
-        courses = Course.objects.annotate(avg_rating=Avg("interactions__rating"))
-
+        # ✅ Full-text search over title/description/syllabus, ranked by relevance
         if search_query:
-            courses = courses.filter(title__icontains=search_query)
+            return self.search(request, search_query, min_rating, category)
 
-        if min_rating:
-            courses = courses.filter(avg_rating__gte=min_rating)
+        # ✅ Same for every user: served as pre-rendered bytes
+        return catalog_response(request, filtered=True)
 
-        serializer = CourseSerializer(courses, many=True)
-        return Response(serializer.data)
+    def search(self, request, search_query, min_rating, category):
+        paginator = SearchPagination()
+        hits = paginator.paginate_search(
+            lambda after, limit: search_courses(search_query, min_rating, category, after=after, limit=limit),
+            request,
+        )
+        return paginator.get_paginated_response(serialize_course_ids([course_id for course_id, _ in hits]))
 
 
 
 
 class InteractionViewSet(ModelViewSet):
-    queryset = Interaction.objects.all()
+    queryset = Interaction.objects.select_related("user", "course")
     serializer_class = InteractionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -234,13 +321,11 @@ def change_password(request):
     user.set_password(new_password)
     user.save()
 
-    # ✅ Send Password Change Notification
-    send_mail(
+    # ✅ Queue Password Change Notification
+    queue_email(
         "Password Change Alert",
         f"Hello {user.username},\n\nYour password was successfully changed. If this wasn't you, please reset your password immediately.\n\nBest,\nTutorly Security Team",
-        settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=False,
     )
 
     return Response({"message": "Password changed successfully!"})
@@ -255,13 +340,11 @@ def enroll_course(request, id):
         enrollment, created = Enrollment.objects.get_or_create(user=user, course=course)
 
         if created:
-            # ✅ Send Enrollment Confirmation Email
-            send_mail(
+            # ✅ Queue Enrollment Confirmation Email
+            queue_email(
                 "Enrollment Confirmation",
                 f"Hello {user.username},\n\nYou have successfully enrolled in '{course.title}'. Happy learning!\n\nBest,\nTutorly Team",
-                settings.EMAIL_HOST_USER,
                 [user.email],
-                fail_silently=False,
             )
             return Response({"message": "Enrolled successfully!"}, status=201)
         else:
@@ -276,13 +359,13 @@ def welcome_view(request):
     return Response({"message": "Welcome to Tutorly!"})
 
 @api_view(['GET'])
+@condition(etag_func=catalog_etag)
 def course_list(request):
-    courses = Course.objects.all()
-    serializer = CourseSerializer(courses, many=True)
-    return Response(serializer.data)
+    return catalog_response(request, filtered=False)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=course_etag)
 def course_detail(request, id):
     try:
         course = Course.objects.get(id=id)
@@ -293,21 +376,49 @@ def course_detail(request, id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=course_etag)
 def course_feedback(request, id):
     try:
         course = Course.objects.get(id=id)
         
-        # ✅ Print debug info
-        feedbacks = Interaction.objects.filter(course=course).exclude(feedback="")  # This filters out empty feedback
-        print(f"All feedbacks for {course.title}:", feedbacks)
+        # ✅ select_related: the serializer renders user and course as strings
+        feedbacks = (
+            Interaction.objects.filter(course=course)
+            .filter(feedback__gt="")  # Non-empty feedback; matches the partial index
+            .select_related("user", "course")
+        )
 
-        serializer = InteractionSerializer(feedbacks, many=True)
-        return Response(serializer.data)
+        paginator = FeedbackPagination()
+        page = paginator.paginate_queryset(feedbacks, request)
+        serializer = InteractionSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     except Course.DoesNotExist:
         return Response({"error": "Course not found"}, status=404)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def course_similar(request, id):
+    # ✅ One indexed read: the course's stored neighbor list, joined to the courses, in rank order
+    rows = course_rows()
+    neighbors = Course.objects.filter(neighbor_of__course_id=id).order_by("neighbor_of__rank")
+    similar_courses = rows.many(rows.queryset(neighbors))
+    if not similar_courses and not Course.objects.filter(id=id).exists():
+        return Response({"error": "Course not found"}, status=404)
+    return Response({"course_id": id, "similar_courses": similar_courses})
+
+
+def save_rating(user, course, rating, feedback):
+    with transaction.atomic():
+        interaction = Interaction.objects.select_for_update().filter(user=user, course=course).first()
+        if interaction is None:
+            interaction = Interaction(user=user, course=course)
+        interaction.rating = rating
+        interaction.feedback = feedback if feedback else "No feedback"
+        interaction.save()
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def rate_course(request, id):
@@ -319,12 +430,15 @@ def rate_course(request, id):
 
         if not rating or not (1 <= int(rating) <= 5):
             return Response({"error": "Rating must be between 1 and 5."}, status=400)
+        rating = int(rating)
 
-        # ✅ Ensure rating is saved, even if feedback is empty
-        interaction, created = Interaction.objects.update_or_create(
-            user=user, course=course,
-            defaults={"rating": rating, "feedback": feedback if feedback else "No feedback"}
-        )
+        # ✅ Ensure rating is saved, even if feedback is empty. The row lock keeps the
+        # stored rating fresh, so the Course aggregate delta applied on save is exact.
+        try:
+            save_rating(user, course, rating, feedback)
+        except IntegrityError:
+            # A concurrent first rating inserted the (user, course) row; now there is one to lock
+            save_rating(user, course, rating, feedback)
 
         return Response({"message": f"Rated {course.title} with {rating} stars!"})
 
@@ -332,28 +446,108 @@ def rate_course(request, id):
         return Response({"error": "Course not found"}, status=404)
 
 
-@api_view(["GET", "POST"])
+MAX_BULK_RATINGS = 1000
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_rate_courses(request):
+    # ✅ Accepts [{course_id, rating, feedback}, ...] (or {"ratings": [...]}); all-or-nothing
+    items = request.data.get("ratings") if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not items:
+        return Response({"error": "Send a non-empty list of {course_id, rating, feedback}."}, status=400)
+    if len(items) > MAX_BULK_RATINGS:
+        return Response({"error": f"At most {MAX_BULK_RATINGS} ratings per request."}, status=400)
+
+    serializer = RatingInputSerializer(data=items, many=True)
+    if not serializer.is_valid():
+        return Response({"errors": serializer.errors}, status=400)
+
+    # Later entries for the same course win, as if they had been posted one by one
+    ratings = {
+        item["course_id"]: (item["rating"], item["feedback"].strip() or "No feedback")
+        for item in serializer.validated_data
+    }
+    found = Course.objects.only("id").in_bulk(list(ratings))
+    missing = sorted(set(ratings) - set(found))
+    if missing:
+        return Response({"error": "Course not found", "course_ids": missing}, status=404)
+
+    created, updated = upsert_ratings(request.user, ratings)
+    schedule_catalog_rebuild()
+    return Response({"message": f"Saved {len(ratings)} ratings.", "created": created, "updated": updated})
+
+
+def _topic_list(value):
+    """A JSON list of topic ids (ints or strings), or None if malformed."""
+    if not isinstance(value, list) or not all(isinstance(topic, (int, str)) for topic in value):
+        return None
+    return value
+
+
+@api_view(["GET", "POST", "PATCH"])
 @permission_classes([IsAuthenticated])
 def update_progress(request, course_id):
     user = request.user
-    enrollment, created = Enrollment.objects.get_or_create(user=user, course_id=course_id)
+    enrollments = Enrollment.objects.filter(user=user, course_id=course_id)
 
     if request.method == "GET":
-        print(f"Checking progress for user {user.username} in course {course_id}: {enrollment.completed_topics}")
-        return Response({"completed_topics": enrollment.completed_topics})
-
-    elif request.method == "POST":
-        completed_topics = request.data.get("completed_topics", [])
+        completed_topics = enrollments.values_list("completed_topics", flat=True).first()
+        return Response({"completed_topics": completed_topics or []})
 
-        if not isinstance(completed_topics, list):
+    if request.method == "POST":
+        # ✅ Replace the whole list in one UPDATE; only create the enrollment if it's missing
+        completed_topics = _topic_list(request.data.get("completed_topics", []))
+        if completed_topics is None:
             return Response({"error": "Invalid data format"}, status=400)
-
-        print(f"Updating progress for user {user.username} in course {course_id}: {completed_topics}")
-        enrollment.completed_topics = completed_topics
-        enrollment.save()
-
-        # ✅ Double-check if progress is saved correctly
-        saved_enrollment = Enrollment.objects.get(user=user, course_id=course_id)
-        print("Saved Topics:", saved_enrollment.completed_topics)
-
-        return Response({"message": "Progress updated successfully!", "completed_topics": saved_enrollment.completed_topics})
+        if not enrollments.update(completed_topics=completed_topics):
+            if not Course.objects.filter(id=course_id).exists():
+                return Response({"error": "Course not found"}, status=404)
+            Enrollment.objects.update_or_create(user=user, course_id=course_id,
+                                                defaults={"completed_topics": completed_topics})
+        return Response({"message": "Progress updated successfully!", "completed_topics": completed_topics})
+
+    # ✅ PATCH {"add": [...], "remove": [...]}: merged under a row lock, so concurrent tabs don't lose ticks
+    add = _topic_list(request.data.get("add", []))
+    remove = _topic_list(request.data.get("remove", []))
+    if add is None or remove is None:
+        return Response({"error": "'add' and 'remove' must be lists of topics."}, status=400)
+
+    with transaction.atomic():
+        enrollment = enrollments.select_for_update().first()
+        if enrollment is None:
+            if not Course.objects.filter(id=course_id).exists():
+                return Response({"error": "Course not found"}, status=404)
+            Enrollment.objects.get_or_create(user=user, course_id=course_id)
+            enrollment = enrollments.select_for_update().get()
+        removed = set(remove)
+        topics = [topic for topic in enrollment.completed_topics if topic not in removed]
+        topics += [topic for topic in dict.fromkeys(add) if topic not in topics and topic not in removed]
+        if topics != enrollment.completed_topics:
+            enrollment.completed_topics = topics
+            enrollment.save(update_fields=["completed_topics"])
+
+    return Response({"message": "Progress updated successfully!", "completed_topics": topics})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def progress_summary(request):
+    # ✅ Every enrollment's progress from one query, using the stored per-course topic count
+    rows = (
+        Enrollment.objects.filter(user=request.user)
+        .order_by("-enrolled_at")
+        .values("course_id", "course__title", "course__topic_count", "completed_topics")
+    )
+    progress = []
+    for row in rows:
+        total = row["course__topic_count"]
+        completed = min(len(row["completed_topics"]), total) if total else len(row["completed_topics"])
+        progress.append({
+            "course_id": row["course_id"],
+            "title": row["course__title"],
+            "completed_topics": completed,
+            "total_topics": total,
+            "percent": round(100 * completed / total, 1) if total else 0.0,
+        })
+    return Response({"progress": progress})
@@ -82,17 +82,20 @@ const CourseDetail = () => {
     const token = localStorage.getItem("access_token");
     if (!token) return;
 
-    const updatedTopics = completedTopics.includes(topicIndex)
+    const done = completedTopics.includes(topicIndex);
+    const updatedTopics = done
       ? completedTopics.filter((t) => t !== topicIndex)
       : [...completedTopics, topicIndex];
     setCompletedTopics(updatedTopics);
 
     try {
-      await axios.post(
+      // ✅ Send only the change, so ticks from other tabs aren't overwritten
+      const response = await axios.patch(
         `http://127.0.0.1:8000/api/courses/${id}/progress/`,
-        { completed_topics: updatedTopics },
+        done ? { remove: [topicIndex] } : { add: [topicIndex] },
         { headers: { Authorization: `Bearer ${token}` } }
       );
+      setCompletedTopics(response.data.completed_topics);
     } catch (error) {
       console.error("Error updating progress", error);
     }
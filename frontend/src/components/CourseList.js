@@ -5,13 +5,27 @@ import "./styles.css";
 
 const CourseList = () => {
     const [courses, setCourses] = useState([]);
+    const [nextUrl, setNextUrl] = useState(null); // ✅ Cursor link to the next page, null on the last one
     const [isLoading, setIsLoading] = useState(true);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [error, setError] = useState(null);
     const [searchQuery, setSearchQuery] = useState("");
     const [minRating, setMinRating] = useState("");
     const [category, setCategory] = useState(""); 
     const navigate = useNavigate();
 
+    const handleFetchError = useCallback((error) => {
+        console.error("❌ Failed to fetch courses:", error);
+
+        if (error.response?.status === 401) {
+            console.warn("⚠️ Unauthorized - Clearing token and redirecting...");
+            localStorage.removeItem("access_token");
+            navigate("/login");
+        } else {
+            setError("Failed to load courses. Please try again.");
+        }
+    }, [navigate]);
+
     // ✅ Wrap fetchCourses in useCallback to avoid infinite loop
     const fetchCourses = useCallback(async () => {
         const token = localStorage.getItem("access_token");
@@ -40,21 +54,37 @@ const CourseList = () => {
             });
 
             console.log("✅ Courses API Response:", response.data);
-            setCourses(response.data);
+            // ✅ Paginated response: { next, previous, results }; new filters start from the first page
+            setCourses(response.data.results);
+            setNextUrl(response.data.next);
         } catch (error) {
-            console.error("❌ Failed to fetch courses:", error);
-
-            if (error.response?.status === 401) {
-                console.warn("⚠️ Unauthorized - Clearing token and redirecting...");
-                localStorage.removeItem("access_token");
-                navigate("/login");
-            } else {
-                setError("Failed to load courses. Please try again.");
-            }
+            handleFetchError(error);
         } finally {
             setIsLoading(false);
         }
-    }, [searchQuery, minRating, category, navigate]);
+    }, [searchQuery, minRating, category, navigate, handleFetchError]);
+
+    // ✅ Follow the `next` cursor and append the page, so the whole catalog is reachable
+    const loadMore = async () => {
+        const token = localStorage.getItem("access_token");
+        if (!nextUrl || isLoadingMore || !token) return;
+
+        setIsLoadingMore(true);
+        try {
+            const response = await axios.get(nextUrl, {
+                headers: { Authorization: `Bearer ${token}` },
+            });
+            setCourses((loaded) => {
+                const seen = new Set(loaded.map((course) => course.id));
+                return [...loaded, ...response.data.results.filter((course) => !seen.has(course.id))];
+            });
+            setNextUrl(response.data.next);
+        } catch (error) {
+            handleFetchError(error);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
 
     // ✅ Now useEffect safely includes fetchCourses
     useEffect(() => {
@@ -129,6 +159,14 @@ const CourseList = () => {
             ) : (
                 <p className="text-center text-danger">No courses found.</p>
             )}
+
+            {nextUrl && (
+                <div className="text-center mb-4">
+                    <button className="btn btn-outline-primary" onClick={loadMore} disabled={isLoadingMore}>
+                        {isLoadingMore ? "Loading..." : "Load more courses"}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };